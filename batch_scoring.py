@@ -0,0 +1,132 @@
+"""Upload-and-score support for the batch tab of app.py
+
+An uploaded CSV is scored in chunks with the bulk_score.py pipeline and each
+scored chunk is written to a CSV part file in a temporary directory. Session
+state only holds the key of the BatchJob in the shared artifact cache (see
+session.py): the table reads one page of rows from the parts on each rerun,
+and the download joins the parts on request.
+"""
+import io
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+
+import pandas as pd
+
+from bulk_score import score_chunk
+
+BATCH_CHUNK_SIZE = 50000
+PAGE_SIZE = 100
+
+
+class BatchJobExpired(FileNotFoundError):
+    """The job's files were removed (idle session, cache eviction or exit)"""
+
+
+class BatchJob:
+    """Scored rows of one upload, stored as CSV part files on disk"""
+
+    def __init__(self, name):
+        self.name = name
+        self.directory = Path(tempfile.mkdtemp(prefix='predictor-batch-'))
+        self.part_rows = []
+        # Delete the files when the session drops the job or the process exits
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    @property
+    def rows(self):
+        return sum(self.part_rows)
+
+    @property
+    def page_count(self):
+        return max(1, -(-self.rows // PAGE_SIZE))
+
+    @property
+    def download_name(self):
+        return f"{Path(self.name).stem}_scored.csv"
+
+    @property
+    def nbytes(self):
+        """Bytes on disk, counted against the shared artifact cache budget"""
+        return sum(path.stat().st_size for path in self.directory.glob('*') if path.is_file())
+
+    def part_path(self, index):
+        return self.directory / f"part-{index:05d}.csv"
+
+    @property
+    def expired(self):
+        return not self._finalizer.alive or not self.directory.is_dir()
+
+    def _expired_error(self):
+        return BatchJobExpired(f"The scored rows of {self.name} were removed to free space; score the file again")
+
+    def _read_part(self, index, **kwargs):
+        if self.expired:
+            raise self._expired_error()
+        try:
+            return pd.read_csv(self.part_path(index), **kwargs)
+        except FileNotFoundError as exc:
+            raise self._expired_error() from exc
+
+    def add_part(self, chunk):
+        chunk.to_csv(self.part_path(len(self.part_rows)), index=False)
+        self.part_rows.append(len(chunk))
+
+    def page(self, number, page_size=PAGE_SIZE):
+        """Rows of the 0-based page number, read only from the parts it spans"""
+        start = number * page_size
+        frames = []
+        for index, rows in enumerate(self.part_rows):
+            if start >= rows:
+                start -= rows
+                continue
+            take = min(page_size - sum(len(frame) for frame in frames), rows - start)
+            frames.append(self._read_part(index, skiprows=range(1, start + 1), nrows=take))
+            start = 0
+            if sum(len(frame) for frame in frames) >= page_size:
+                break
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def export(self):
+        """The parts joined into one CSV, built only when the download is clicked
+
+        Streamlit holds download data in memory anyway, so no joined copy is
+        written next to the parts. Raises BatchJobExpired if the job was
+        released after its download button was rendered.
+        """
+        if self.expired:
+            raise self._expired_error()
+        output = io.BytesIO()
+        try:
+            for index in range(len(self.part_rows)):
+                with open(self.part_path(index), 'rb') as part:
+                    if index:
+                        part.readline()
+                    shutil.copyfileobj(part, output, 1024 * 1024)
+        except FileNotFoundError as exc:
+            raise self._expired_error() from exc
+        return output.getvalue()
+
+    def cleanup(self):
+        self._finalizer()
+
+
+def score_upload(uploaded_file, model, language='en', rng=None, on_progress=None, chunk_size=BATCH_CHUNK_SIZE):
+    """Score an uploaded CSV chunk by chunk into a new BatchJob
+
+    on_progress(rows, fraction) is called after each chunk with the fraction
+    of the upload read so far. The job's files are removed if scoring fails.
+    """
+    job = BatchJob(getattr(uploaded_file, 'name', 'customers.csv'))
+    size = getattr(uploaded_file, 'size', None)
+    try:
+        for chunk in pd.read_csv(uploaded_file, chunksize=chunk_size):
+            job.add_part(score_chunk(chunk, model, language, rng))
+            if on_progress is not None:
+                fraction = min(uploaded_file.tell() / size, 1.0) if size else 0.0
+                on_progress(job.rows, fraction)
+    except BaseException:
+        job.cleanup()
+        raise
+    return job
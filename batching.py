@@ -0,0 +1,93 @@
+"""Micro-batching of interactive predictions from concurrent sessions
+
+Each session's script thread submits its prediction to one shared
+PredictionBroker and waits on a future. A worker thread takes whatever is
+queued, waits up to `window_ms` for more requests while other sessions are
+predicting too, and scores up to `max_batch_size` requests with one
+predict_batch call. A lone request is scored as soon as it arrives, so a
+single user does not pay the window.
+
+Noise is drawn on the calling thread from the session's own generator, so
+each session's scores are the same as with predict_spending_score().
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class PredictionBroker:
+    """Shared queue that scores concurrent single predictions as one batch"""
+
+    def __init__(self, model, window_ms=2.0, max_batch_size=256):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._last_batch_size = 0
+        self._worker = threading.Thread(target=self._run, name='prediction-broker', daemon=True)
+        self._worker.start()
+
+    def submit(self, age, income, membership_years, purchase_frequency, rng=None):
+        """Queue one prediction and return a Future of its score"""
+        noise = rng.normal(0, self.model.noise_std) if rng is not None and self.model.noise_std else 0.0
+        future = Future()
+        with self._condition:
+            self._queue.append((age, income, membership_years, purchase_frequency, noise, future))
+            self._condition.notify()
+        return future
+
+    def predict(self, age, income, membership_years, purchase_frequency, rng=None, timeout=None):
+        """Score one customer through the broker and wait for the result"""
+        return self.submit(age, income, membership_years, purchase_frequency, rng).result(timeout)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'batches': self.batches,
+                'requests': self.requests,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'largest_batch': self.largest_batch,
+            }
+
+    def _take_batch(self):
+        with self._condition:
+            while not self._queue:
+                self._condition.wait()
+            # Only wait for company when the last batch had some; a lone user is scored at once
+            if self._last_batch_size > 1 or len(self._queue) > 1:
+                deadline = time.perf_counter() + self.window
+                while len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            size = min(len(self._queue), self.max_batch_size)
+            batch = [self._queue.popleft() for _ in range(size)]
+            self._last_batch_size = size
+            self.batches += 1
+            self.requests += size
+            self.largest_batch = max(self.largest_batch, size)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            batch = [request for request in batch if request[-1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                columns = np.array([request[:5] for request in batch], dtype=np.float64)
+                scores = self.model.predict_batch(*columns.T[:4], noise=columns[:, 4]).tolist()
+            except Exception as exc:
+                for request in batch:
+                    request[-1].set_exception(exc)
+                continue
+            for request, score in zip(batch, scores):
+                request[-1].set_result(score)
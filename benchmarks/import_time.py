@@ -0,0 +1,89 @@
+"""Measure the import cost of app.py's startup path in fresh interpreters
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 10 --json import_time.json
+
+The module lists are read from app.py: its top-level imports (startup) and
+the imports inside its functions and blocks (deferred). Each group is
+imported in app.py's order with `python -X importtime` in a new process, so
+the totals are what a fresh container pays before the welcome screen and on
+the first rendered result. A module already loaded by an earlier one in its
+group costs nothing of its own; its time is part of that earlier module's.
+"""
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / 'app.py'
+
+
+def app_imports(path=APP_PATH):
+    """(startup, deferred) module names imported by app.py, in source order"""
+    tree = ast.parse(Path(path).read_text(encoding='utf-8'))
+    top_level = {id(node) for node in tree.body}
+    startup, deferred = [], []
+    nodes = [node for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))]
+    for node in sorted(nodes, key=lambda node: node.lineno):
+        names = [alias.name for alias in node.names] if isinstance(node, ast.Import) else [node.module]
+        group = startup if id(node) in top_level else deferred
+        for name in names:
+            if name not in startup and name not in group:
+                group.append(name)
+    return startup, deferred
+
+
+def import_time_ms(modules):
+    """Cumulative import time of each top-level module in one fresh process"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Top-level imports are the ones without indentation in the name column
+        if name.startswith(' ') and not name.startswith('  ') and name.strip() in modules:
+            timings[name.strip()] = int(cumulative) / 1000
+    return timings
+
+
+def measure(modules, repeat):
+    """Median import time of each module; 0 for modules an earlier one already loaded"""
+    samples = {module: [] for module in modules}
+    for _ in range(repeat):
+        for module, ms in import_time_ms(modules).items():
+            samples[module].append(ms)
+    return {module: statistics.median(values) if values else 0.0 for module, values in samples.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the startup import cost of app.py")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per group (default: %(default)s)")
+    parser.add_argument('--json', help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    startup, deferred = app_imports()
+    results = {}
+    for group, modules in (('startup', startup), ('deferred', deferred)):
+        timings = measure(modules, args.repeat)
+        results[group] = {'modules': timings, 'total_ms': sum(timings.values())}
+
+        print(f"{group} imports (median of {args.repeat} runs)")
+        for module, ms in sorted(timings.items(), key=lambda item: -item[1]):
+            print(f"  {module:<24} {ms:9.1f} ms" + ("" if ms else "  (loaded by an earlier import)"))
+        print(f"  {'total':<24} {results[group]['total_ms']:9.1f} ms\n")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Measure how parallel_score.py scales with the number of worker processes
+
+Usage:
+    python benchmarks/parallel_speedup.py
+    python benchmarks/parallel_speedup.py --rows 10000000 --workers 1 2 4 8 --json speedup.json
+
+A synthetic customer CSV is written to a temporary directory and scored
+without noise at each worker count; speed-up is relative to one worker.
+Speed-up stops growing once the workers outnumber the CPU cores or the
+input parts (one per PART_BYTES of the file, about 8 MB).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from parallel_score import run  # noqa: E402
+from scoring import MOCK_MODEL  # noqa: E402
+
+
+def write_customers(path, rows, seed=0):
+    """Write rows random customers within the sidebar ranges to a CSV"""
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'customer_id': np.arange(rows),
+        'age': rng.integers(18, 71, rows),
+        'income': rng.integers(0, 101, rows) * 5000,
+        'membership_years': rng.integers(0, 21, rows),
+        'purchase_frequency': rng.integers(0, 101, rows),
+    }).to_csv(path, index=False)
+
+
+def time_run(input_path, output_path, workers, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(input_path, output_path, MOCK_MODEL, workers=workers, noise=False, quiet=True)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report parallel_score.py speed-up per worker count")
+    parser.add_argument('--rows', type=int, default=2000000, help="Synthetic customers to score (default: %(default)s)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="Worker counts to try (default: 1 2 4 8)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per worker count (default: %(default)s)")
+    parser.add_argument('--json', help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = Path(tmp_dir) / 'customers.csv'
+        output_path = Path(tmp_dir) / 'scored.csv'
+        write_customers(input_path, args.rows)
+
+        results = {'rows': args.rows, 'cpu_count': os.cpu_count(), 'runs': []}
+        print(f"{args.rows:,} rows, {os.cpu_count()} CPUs (median of {args.repeat} runs)")
+        baseline = None
+        for workers in args.workers:
+            seconds = time_run(input_path, output_path, workers, args.repeat)
+            baseline = baseline or seconds
+            run_result = {
+                'workers': workers,
+                'seconds': seconds,
+                'rows_per_second': args.rows / seconds,
+                'speedup': baseline / seconds,
+            }
+            results['runs'].append(run_result)
+            print(f"  {workers:>3} workers {seconds:8.2f} s {run_result['rows_per_second']:>12,.0f} rows/s {run_result['speedup']:6.2f}x")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Time the scoring and rendering hot paths and compare runs between commits
+
+Usage:
+    python benchmarks/run_benchmarks.py --json before.json
+    python benchmarks/run_benchmarks.py --json after.json --compare before.json
+    python benchmarks/run_benchmarks.py --batch-sizes 1000 1000000 --only batch
+
+Every benchmark runs in this process with no network access. A callable is
+looped until one measurement takes at least 0.2 s, measured --repeat times,
+and the fastest measurement is reported per call. With --compare, each
+result is shown against the baseline file and the exit status is 1 if any
+benchmark got slower than --threshold times its baseline.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scoring import MOCK_MODEL, get_recommendation, make_rng, predict_spending_score, predict_spending_scores  # noqa: E402
+from styles import get_inline_css, stylesheet_version  # noqa: E402
+
+DEFAULT_BATCH_SIZES = [1000, 1000000, 10000000]
+
+
+def time_per_call(func, repeat):
+    """Fastest seconds per call of func over repeat auto-ranged measurements"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def random_customers(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(18, 71, rows).astype(np.float64),
+        (rng.integers(0, 101, rows) * 5000).astype(np.float64),
+        rng.integers(0, 21, rows).astype(np.float64),
+        rng.integers(0, 101, rows).astype(np.float64),
+    )
+
+
+def selected(name, only):
+    return not only or any(pattern in name for pattern in only)
+
+
+def scoring_benchmarks(batch_sizes, only):
+    rng = make_rng(0)
+    yield 'predict_scalar', lambda: predict_spending_score(35, 50000, 5, 25)
+    yield 'predict_scalar_noise', lambda: predict_spending_score(35, 50000, 5, 25, rng=rng)
+    for rows in batch_sizes:
+        name = f"predict_batch_{rows}"
+        if not selected(name, only):
+            continue
+        # Inputs are only generated for batches that will run (10M rows is ~320 MB)
+        customers = random_customers(rows)
+        yield name, (lambda customers=customers: predict_spending_scores(*customers, rng=rng)), rows
+
+
+def recommendation_benchmarks():
+    for name, score in (('high', 85.0), ('medium', 55.0), ('low', 20.0)):
+        yield f"get_recommendation_{name}", lambda score=score: get_recommendation(score, 'en')
+
+
+def css_benchmarks():
+    def cold():
+        stylesheet_version.cache_clear()
+        get_inline_css.cache_clear()
+        return get_inline_css('dark', 'ar')
+
+    yield 'inline_css_cold', cold
+    yield 'inline_css_cached', lambda: get_inline_css('dark', 'ar')
+
+
+def chart_benchmarks():
+    import plotly.io as pio
+
+    import charts
+
+    def build_gauge():
+        charts.gauge_template.cache_clear()
+        return charts.gauge_template('light', 'en')
+
+    def build_contributions():
+        charts.contributions_template.cache_clear()
+        return charts.contributions_template('light', 'en')
+
+    def serialize_gauge():
+        # st.plotly_chart serializes the figure the same way
+        with charts.gauge_chart(72.5, 'light', 'en') as fig:
+            return pio.to_json(fig, validate=False)
+
+    def serialize_contributions():
+        with charts.contributions_chart([12.3, 40.1, 20.0, 27.6], 'light', 'en') as fig:
+            return pio.to_json(fig, validate=False)
+
+    yield 'gauge_build', build_gauge
+    yield 'gauge_fill_serialize', serialize_gauge
+    yield 'contributions_build', build_contributions
+    yield 'contributions_fill_serialize', serialize_contributions
+
+
+GROUPS = {
+    'scoring': lambda args: scoring_benchmarks(args.batch_sizes, args.only),
+    'recommendation': lambda args: recommendation_benchmarks(),
+    'css': lambda args: css_benchmarks(),
+    'charts': lambda args: chart_benchmarks(),
+}
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(args):
+    for group, benchmarks in GROUPS.items():
+        for name, func, *rows in benchmarks(args):
+            if not selected(name, args.only):
+                continue
+            seconds = time_per_call(func, args.repeat)
+            result = {'group': group, 'seconds_per_call': seconds}
+            if rows:
+                result['rows_per_second'] = rows[0] / seconds
+            yield name, result
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scoring, recommendations, CSS and charts")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=DEFAULT_BATCH_SIZES, help="Rows per batch scoring benchmark (default: 1000 1000000 10000000)")
+    parser.add_argument('--repeat', type=int, default=5, help="Measurements per benchmark (default: %(default)s)")
+    parser.add_argument('--only', nargs='+', help="Only run benchmarks whose name contains one of these strings")
+    parser.add_argument('--json', help="Write the results to this JSON file")
+    parser.add_argument('--compare', help="Baseline JSON file from an earlier run")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Slow-down ratio reported as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.compare).read_text())['results'] if args.compare else {}
+    results = {}
+    regressions = []
+    for name, result in run(args):
+        results[name] = result
+        line = f"{name:<32} {format_seconds(result['seconds_per_call'])}"
+        if 'rows_per_second' in result:
+            line += f" {result['rows_per_second']:>14,.0f} rows/s"
+        if name in baseline:
+            ratio = result['seconds_per_call'] / baseline[name]['seconds_per_call']
+            line += f"   {ratio:5.2f}x baseline"
+            if ratio > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'model_version': MOCK_MODEL.version,
+            'results': results,
+        }, indent=2))
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}x: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
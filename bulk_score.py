@@ -0,0 +1,234 @@
+"""Headless bulk scoring for CSV and Parquet customer files
+
+Usage:
+    python bulk_score.py customers.csv scored.csv
+    python bulk_score.py customers.parquet scored.parquet --chunk-size 250000 --language ar
+    python bulk_score.py customers.csv scored/ --format columnar
+
+Input rows are read in fixed-size chunks, scored with the model in scoring.py,
+tagged with the get_recommendation tier and appended to the output, so memory
+use depends on the chunk size rather than on the file size.
+
+--format rows (default) copies the input columns and adds a localised
+category; --format columnar writes only typed score, tier and contribution
+columns (see columnar.py).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from columnar import TIER_COLUMN, columnar_writer, require_pyarrow, score_columns
+from scoring import FEATURES, SCORE_COLUMN, load_model, make_rng, score_tiers, tier_labels
+from segments import SegmentStats
+from settings import settings, resolve_path
+from translations import translations
+
+CATEGORY_COLUMN = 'customer_category'
+CONTRIBUTION_COLUMNS = [f"{feature}_contribution" for feature in FEATURES]
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def file_format(path):
+    """Return 'csv' or 'parquet' based on the file extension"""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.parquet', '.pq'):
+        return 'parquet'
+    if suffix in ('.csv', '.txt') or path == '-':
+        return 'csv'
+    raise ValueError(f"Unsupported file type: {path} (expected .csv or .parquet)")
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield DataFrames of at most chunk_size rows from a CSV or Parquet file"""
+    if file_format(path) == 'parquet':
+        pq = require_pyarrow()
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(sys.stdin if path == '-' else path, chunksize=chunk_size)
+
+
+def restore_integer_columns(chunk):
+    """Turn float columns that only hold whole numbers and blanks back into Int64
+
+    pandas reads an integer column with a blank as float64, so without this
+    the chunk would write 35.0 where the others write 35, and its Parquet
+    schema would not match theirs.
+    """
+    for column in chunk.columns:
+        values = chunk[column]
+        if values.dtype.kind == 'f':
+            missing = values.isna()
+            if missing.any() and (values[~missing] % 1 == 0).all():
+                chunk[column] = values.astype('Int64')
+    return chunk
+
+
+def score_chunk(chunk, model, language='en', rng=None, explain=False):
+    """Attach the spending score and localised tier to one chunk of customers
+
+    With explain, also attach each feature's contribution as a percentage
+    of the noise-free score.
+    """
+    missing = [column for column in FEATURES if column not in chunk.columns]
+    if missing:
+        raise KeyError(f"Missing input columns: {', '.join(missing)}")
+
+    inputs = [chunk[column].to_numpy() for column in FEATURES]
+    scores = model.predict_batch(*inputs, rng=rng)
+
+    chunk = restore_integer_columns(chunk)
+    chunk[SCORE_COLUMN] = scores
+    # Tier codes plus three labels; the text is only expanded when written.
+    # A missing input gives no score, so its category is left empty (code -1)
+    codes = score_tiers(scores).astype(np.int8)
+    codes[~np.isfinite(scores)] = -1
+    chunk[CATEGORY_COLUMN] = pd.Categorical.from_codes(codes, tier_labels(language))
+    if explain:
+        shares = model.contribution_shares(*inputs)
+        for i, column in enumerate(CONTRIBUTION_COLUMNS):
+            chunk[column] = shares[:, i].round(2)
+    return chunk
+
+
+class ChunkWriter:
+    """Append scored chunks to a CSV or Parquet file as they are produced
+
+    The first chunk sets the Parquet schema. If a later chunk has a wider
+    type for a column (a fractional age after whole ones), the file written
+    so far is rewritten once with the column widened to double.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = file_format(path)
+        self._handle = None
+        self._parquet_writer = None
+
+    def write(self, chunk):
+        if self.format == 'parquet':
+            pq = require_pyarrow()
+            import pyarrow as pa
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                schema = self._parquet_writer.schema
+                widened = pa.unify_schemas([schema, table.schema], promote_options='permissive')
+                if not widened.equals(schema):
+                    self._widen_parquet(widened)
+                table = table.select(widened.names).cast(widened)
+            self._parquet_writer.write_table(table)
+        else:
+            header = self._handle is None
+            if header:
+                self._handle = sys.stdout if self.path == '-' else open(self.path, 'w', newline='', encoding='utf-8')
+            chunk.to_csv(self._handle, header=header, index=False)
+
+    def _widen_parquet(self, schema):
+        """Copy the row groups written so far into a new file with the wider schema"""
+        pq = require_pyarrow()
+        self._parquet_writer.close()
+        narrow_path = Path(self.path).with_name(f".{Path(self.path).name}.{os.getpid()}")
+        os.replace(self.path, narrow_path)
+        try:
+            self._parquet_writer = pq.ParquetWriter(self.path, schema)
+            narrow = pq.ParquetFile(narrow_path)
+            for i in range(narrow.num_row_groups):
+                self._parquet_writer.write_table(narrow.read_row_group(i).cast(schema))
+        finally:
+            narrow_path.unlink()
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._handle is not None and self._handle is not sys.stdout:
+            self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def report_progress(rows, started, final=False):
+    """Print rows processed and throughput to stderr"""
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    end = '\n' if final else '\r'
+    print(f"{rows:,} rows scored in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)", end=end, file=sys.stderr, flush=True)
+
+
+def run(input_path, output_path, model, chunk_size=DEFAULT_CHUNK_SIZE, language='en', rng=None, explain=False,
+        segments=None, quiet=False, output_format='rows'):
+    """Score input_path chunk by chunk into output_path and return the row count
+
+    If a SegmentStats is given, every scored chunk is also added to it. With
+    output_format 'columnar', output_path is a .parquet file or a directory
+    of raw column files.
+    """
+    columnar = output_format == 'columnar'
+    rows = 0
+    started = time.perf_counter()
+    with columnar_writer(output_path, model.version) if columnar else ChunkWriter(output_path) as writer:
+        for chunk in iter_chunks(input_path, chunk_size):
+            if columnar:
+                columns = score_columns(chunk, model, rng, explain)
+                scores, tiers = columns[SCORE_COLUMN], columns[TIER_COLUMN]
+                writer.write(columns)
+            else:
+                chunk = score_chunk(chunk, model, language, rng, explain)
+                scores, tiers = chunk[SCORE_COLUMN].to_numpy(), None
+                writer.write(chunk)
+            if segments is not None:
+                segments.update(scores, chunk['income'].to_numpy(), chunk['membership_years'].to_numpy(), tiers)
+            rows += len(chunk)
+            if not quiet:
+                report_progress(rows, started)
+    if not quiet:
+        report_progress(rows, started, final=True)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a customer file without the Streamlit UI")
+    parser.add_argument('input', help="CSV or Parquet file with age, income, membership_years and purchase_frequency columns ('-' for stdin)")
+    parser.add_argument('output', help="CSV or Parquet file to write ('-' for stdout); Parquet file or directory with --format columnar")
+    parser.add_argument('--format', choices=['rows', 'columnar'], default='rows',
+                        help="rows: input columns plus score and category; columnar: float32 score, uint8 tier (and contributions) only")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk (default: %(default)s)")
+    parser.add_argument('--language', choices=sorted(translations), default='en', help="Language of the customer category column")
+    parser.add_argument('--model', default=str(resolve_path(settings['modelPath'])), help="Model artifact from train_model.py (mock coefficients if missing)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed the noise for reproducible output")
+    parser.add_argument('--no-noise', action='store_true', help="Score without noise (deterministic output)")
+    parser.add_argument('--explain', action='store_true', help="Add per-feature contribution columns (percent of score)")
+    parser.add_argument('--segments', help="Write per-tier statistics (counts, means, score histograms) to this JSON file")
+    parser.add_argument('--quiet', action='store_true', help="Do not report progress")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    rng = None if args.no_noise else make_rng(args.seed)
+
+    segments = SegmentStats() if args.segments else None
+    try:
+        run(args.input, args.output, load_model(args.model), args.chunk_size, args.language, rng, args.explain,
+            segments, args.quiet, args.format)
+    except (KeyError, ValueError) as exc:
+        sys.exit(f"Error: {exc}")
+
+    if segments is not None:
+        Path(args.segments).write_text(json.dumps(segments.summary(args.language), indent=2, ensure_ascii=False), encoding='utf-8')
+        if segments.unscored:
+            print(f"{segments.unscored:,} rows with missing inputs are left out of the segment statistics", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
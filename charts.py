@@ -0,0 +1,203 @@
+"""Plotly charts for the results page, built from cached per-(theme, language) templates
+
+Building a figure means validating every nested layout and trace dict,
+which costs far more than the handful of values that change per prediction.
+Each chart is therefore built once per (theme, language) and kept for the
+life of the process; a request only sets its values and hands the figure to
+st.plotly_chart, which serializes it synchronously. A lock per template
+keeps concurrent sessions from seeing each other's values.
+"""
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+import plotly.graph_objects as go
+
+from translations import translations
+
+FEATURE_COLORS = ['#3b82f6', '#10b981', '#f59e0b', '#ef4444']
+
+
+class FigureTemplate:
+    """A pre-built figure whose per-request values are filled in under a lock"""
+
+    def __init__(self, figure):
+        self.figure = figure
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def filled(self, fill):
+        """Yield the figure after fill(figure) has set this request's values"""
+        with self._lock:
+            fill(self.figure)
+            yield self.figure
+
+
+def _text_color(theme):
+    return "#ffffff" if theme == 'dark' else "#0f172a"
+
+
+def _font_family(language):
+    return 'Cairo, sans-serif' if language == 'ar' else 'Inter, sans-serif'
+
+
+@lru_cache(maxsize=None)
+def gauge_template(theme, language):
+    """Spending score gauge with everything but the value and bar color"""
+    t = translations[language]
+    gauge_bg = "#1e293b" if theme == 'dark' else "#f8fafc"
+    text_color = _text_color(theme)
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=0,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': t['spending_score'], 'font': {'size': 28, 'weight': 'bold', 'color': text_color}},
+        delta={'reference': 50, 'increasing': {'color': "#10b981"}},
+        number={'font': {'size': 50, 'weight': 'bold', 'color': text_color}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': "#cbd5e1"},
+            'bar': {'color': "#f59e0b"},
+            'bgcolor': gauge_bg,
+            'borderwidth': 3,
+            'bordercolor': "#cbd5e1",
+            'steps': [
+                {'range': [0, 40], 'color': '#fee2e2'},
+                {'range': [40, 70], 'color': '#fef3c7'},
+                {'range': [70, 100], 'color': '#d1fae5'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=80, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'family': _font_family(language)}
+    )
+    return FigureTemplate(fig)
+
+
+@lru_cache(maxsize=None)
+def contributions_template(theme, language):
+    """Feature analysis bar chart with everything but the bar heights"""
+    t = translations[language]
+    text_color = _text_color(theme)
+
+    fig = go.Figure(data=[
+        go.Bar(
+            x=[t['age'], t['annual_income'], t['membership_years'], t['purchase_frequency']],
+            y=[0, 0, 0, 0],
+            marker_color=FEATURE_COLORS,
+            textposition='outside',
+            textfont={'size': 14, 'weight': 'bold', 'color': text_color}
+        )
+    ])
+
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis={'showgrid': False, 'tickfont': {'size': 12, 'color': text_color}},
+        yaxis={'showgrid': True, 'gridcolor': '#e5e7eb', 'tickfont': {'size': 12, 'color': text_color}},
+        font={'family': _font_family(language)}
+    )
+    return FigureTemplate(fig)
+
+
+@lru_cache(maxsize=None)
+def sensitivity_line_template(theme, language):
+    """Score along one swept input, with a marker at the customer's current value"""
+    text_color = _text_color(theme)
+
+    fig = go.Figure(data=[
+        go.Scatter(x=[], y=[], mode='lines', line={'color': '#3b82f6', 'width': 3}, hoverinfo='x+y'),
+        go.Scatter(x=[], y=[], mode='markers', marker={'color': '#ef4444', 'size': 12}, hoverinfo='x+y'),
+    ])
+
+    fig.update_layout(
+        height=350,
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        showlegend=False,
+        xaxis={'showgrid': False, 'tickfont': {'size': 12, 'color': text_color}, 'title': {'font': {'color': text_color}}},
+        yaxis={'range': [0, 100], 'showgrid': True, 'gridcolor': '#e5e7eb', 'tickfont': {'size': 12, 'color': text_color},
+               'title': {'text': translations[language]['spending_score'], 'font': {'color': text_color}}},
+        font={'family': _font_family(language)}
+    )
+    return FigureTemplate(fig)
+
+
+@lru_cache(maxsize=None)
+def sensitivity_heatmap_template(theme, language):
+    """Score over two swept inputs, with a marker at the customer's current values"""
+    text_color = _text_color(theme)
+
+    fig = go.Figure(data=[
+        go.Heatmap(x=[], y=[], z=[], zmin=0, zmax=100, colorscale='RdYlGn',
+                   colorbar={'tickfont': {'color': text_color}}),
+        go.Scatter(x=[], y=[], mode='markers', marker={'color': text_color, 'size': 12, 'symbol': 'x'}, hoverinfo='x+y'),
+    ])
+
+    fig.update_layout(
+        height=450,
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        showlegend=False,
+        xaxis={'tickfont': {'size': 12, 'color': text_color}, 'title': {'font': {'color': text_color}}},
+        yaxis={'tickfont': {'size': 12, 'color': text_color}, 'title': {'font': {'color': text_color}}},
+        font={'family': _font_family(language)}
+    )
+    return FigureTemplate(fig)
+
+
+def gauge_chart(score, theme, language):
+    """Context manager yielding the gauge filled in with score"""
+    def fill(fig):
+        indicator = fig.data[0]
+        indicator.value = score
+        indicator.gauge.bar.color = "#3b82f6" if score >= 50 else "#f59e0b"
+
+    return gauge_template(theme, language).filled(fill)
+
+
+def contributions_chart(contributions, theme, language):
+    """Context manager yielding the bar chart filled in with the four percentages"""
+    def fill(fig):
+        bar = fig.data[0]
+        bar.y = list(contributions)
+        bar.text = [f"{v}%" for v in contributions]
+
+    return contributions_template(theme, language).filled(fill)
+
+
+def sensitivity_line_chart(x_values, scores, x_label, current_x, current_score, theme, language):
+    """Context manager yielding the line chart of one sweep"""
+    def fill(fig):
+        line, marker = fig.data
+        line.x, line.y = x_values, scores
+        marker.x, marker.y = [current_x], [current_score]
+        fig.layout.xaxis.title.text = x_label
+
+    return sensitivity_line_template(theme, language).filled(fill)
+
+
+def sensitivity_heatmap(x_values, y_values, scores, x_label, y_label, current_x, current_y, theme, language):
+    """Context manager yielding the heatmap of a two-input sweep"""
+    def fill(fig):
+        heatmap, marker = fig.data
+        heatmap.x, heatmap.y, heatmap.z = x_values, y_values, scores
+        marker.x, marker.y = [current_x], [current_y]
+        fig.layout.xaxis.title.text = x_label
+        fig.layout.yaxis.title.text = y_label
+
+    return sensitivity_heatmap_template(theme, language).filled(fill)
@@ -0,0 +1,231 @@
+"""Columnar scored output: float32 scores, uint8 tiers, optional float32 contributions
+
+A columnar output is either a Parquet file with that Arrow schema or a
+directory of raw little-endian column files plus manifest.json:
+
+    scored/
+        manifest.json               rows, model version, tier keys, column dtypes
+        customer_id.bin             int64 (when the input has an integer customer_id;
+                                    MISSING_ID for a blank one)
+        spending_score.bin          float32
+        tier.bin                    uint8 (TIER_LOW/MEDIUM/HIGH, see manifest 'tiers';
+                                    TIER_UNSCORED for rows with a missing input)
+        age_contribution.bin ...    float32 percent of score (with explain)
+
+read_columnar() memory-maps the raw files, so downstream jobs can filter
+hundreds of millions of customers without parsing text or copying data:
+
+    columns = read_columnar('scored')
+    high_value_ids = columns['customer_id'][columns['tier'] == TIER_HIGH]
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scoring import FEATURES, SCORE_COLUMN, TIER_KEYS, HIGH_VALUE_THRESHOLD, MEDIUM_VALUE_THRESHOLD, score_tiers
+
+MANIFEST_NAME = 'manifest.json'
+FORMAT_NAME = 'spending-score-columnar'
+ID_COLUMN = 'customer_id'
+TIER_COLUMN = 'tier'
+# Tier code of rows without a score, outside the range of TIER_KEYS
+TIER_UNSCORED = 255
+MISSING_ID = -1
+CONTRIBUTION_COLUMNS = [f"{feature}_contribution" for feature in FEATURES]
+
+
+def id_values(chunk):
+    """customer_id as int64 with blanks as MISSING_ID, or None if the IDs are not whole numbers
+
+    pandas reads a chunk with a blank ID as float64, which must not drop the
+    column from that chunk only.
+    """
+    if ID_COLUMN not in chunk.columns:
+        return None
+    ids = chunk[ID_COLUMN]
+    if pd.api.types.is_bool_dtype(ids) or not pd.api.types.is_numeric_dtype(ids):
+        return None
+    missing = ids.isna()
+    if not (ids[~missing] % 1 == 0).all():
+        return None
+    return ids.fillna(MISSING_ID).to_numpy(dtype=np.int64)
+
+
+def _select_columns(columns, names):
+    """The columns of a later chunk in the order and set of the first chunk"""
+    absent = [name for name in names if name not in columns]
+    if absent:
+        raise ValueError(f"Column {', '.join(absent)} of the first chunk is missing from a later chunk "
+                         f"(is every {ID_COLUMN} an integer?)")
+    return {name: columns[name] for name in names}
+
+
+def score_columns(chunk, model, rng=None, explain=False):
+    """Score one DataFrame chunk into a dict of typed column arrays"""
+    missing = [column for column in FEATURES if column not in chunk.columns]
+    if missing:
+        raise KeyError(f"Missing input columns: {', '.join(missing)}")
+
+    inputs = [chunk[column].to_numpy() for column in FEATURES]
+    scores = model.predict_batch(*inputs, rng=rng)
+    columns = {}
+    # Text or fractional IDs are left out rather than written as text
+    ids = id_values(chunk)
+    if ids is not None:
+        columns[ID_COLUMN] = ids
+    columns[SCORE_COLUMN] = scores.astype(np.float32)
+    tiers = score_tiers(scores)
+    tiers[~np.isfinite(scores)] = TIER_UNSCORED
+    columns[TIER_COLUMN] = tiers
+    if explain:
+        shares = model.contribution_shares(*inputs).astype(np.float32)
+        for i, column in enumerate(CONTRIBUTION_COLUMNS):
+            columns[column] = shares[:, i]
+    return columns
+
+
+def require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("Parquet support requires pyarrow: pip install pyarrow")
+    return pq
+
+
+def is_parquet(path):
+    return Path(path).suffix.lower() in ('.parquet', '.pq')
+
+
+class RawColumnWriter:
+    """Append column chunks to raw .bin files and write the manifest on close
+
+    The first chunk fixes the column set and dtypes; later chunks are cast
+    to it. Leaving the with block on an exception writes no manifest, so a
+    partial output is never mistaken for a complete one.
+    """
+
+    def __init__(self, directory, model_version):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.model_version = model_version
+        self.rows = 0
+        self._dtypes = {}
+        self._files = {}
+        # A stale manifest must not describe the files being rewritten
+        (self.directory / MANIFEST_NAME).unlink(missing_ok=True)
+
+    def write(self, columns):
+        if not self._files:
+            for name, values in columns.items():
+                if not (np.issubdtype(values.dtype, np.number) or values.dtype == np.bool_):
+                    raise ValueError(f"Column {name} must be numeric for raw columnar output (use .parquet)")
+                self._dtypes[name] = values.dtype.newbyteorder('<')
+                self._files[name] = open(self.directory / f"{name}.bin", 'wb')
+        else:
+            columns = _select_columns(columns, self._files)
+        for name, values in columns.items():
+            self._files[name].write(np.ascontiguousarray(values, dtype=self._dtypes[name]).tobytes())
+        self.rows += len(next(iter(columns.values())))
+
+    def close(self, complete=True):
+        for handle in self._files.values():
+            handle.close()
+        if not complete:
+            return
+        manifest = {
+            'format': FORMAT_NAME,
+            'version': 1,
+            'rows': self.rows,
+            'model_version': self.model_version,
+            'tiers': list(TIER_KEYS),
+            'unscored_tier': TIER_UNSCORED,
+            'thresholds': {'medium_value': MEDIUM_VALUE_THRESHOLD, 'high_value': HIGH_VALUE_THRESHOLD},
+            'columns': {name: dtype.str for name, dtype in self._dtypes.items()},
+        }
+        tmp_path = self.directory / f".{MANIFEST_NAME}.{os.getpid()}"
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp_path, self.directory / MANIFEST_NAME)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(complete=exc_type is None)
+
+
+class ParquetColumnWriter:
+    """Append column chunks to a Parquet file with the columnar Arrow schema
+
+    Like RawColumnWriter, the first chunk fixes the schema. The file is
+    written under a temporary name and only renamed to path once complete.
+    """
+
+    def __init__(self, path, model_version):
+        self.pq = require_pyarrow()
+        self.path = Path(path)
+        self.model_version = model_version
+        self.rows = 0
+        self._writer = None
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+
+    def write(self, columns):
+        import pyarrow as pa
+
+        if self._writer is not None:
+            columns = _select_columns(columns, self._writer.schema.names)
+        table = pa.table(columns)
+        if self._writer is None:
+            schema = table.schema.with_metadata({
+                'model_version': self.model_version,
+                'tiers': json.dumps(list(TIER_KEYS)),
+                'unscored_tier': str(TIER_UNSCORED),
+            })
+            self._writer = self.pq.ParquetWriter(self._tmp_path, schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+        self.rows += table.num_rows
+
+    def close(self, complete=True):
+        if self._writer is None:
+            return
+        self._writer.close()
+        if complete:
+            os.replace(self._tmp_path, self.path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(complete=exc_type is None)
+
+
+def columnar_writer(path, model_version):
+    """Parquet writer for a .parquet path, raw column directory otherwise"""
+    if is_parquet(path):
+        return ParquetColumnWriter(path, model_version)
+    return RawColumnWriter(path, model_version)
+
+
+def read_manifest(directory):
+    manifest = json.loads((Path(directory) / MANIFEST_NAME).read_text())
+    if manifest.get('format') != FORMAT_NAME:
+        raise ValueError(f"{directory} is not a columnar scored output")
+    return manifest
+
+
+def read_columnar(directory):
+    """Memory-map the columns of a raw columnar output read-only, by column name"""
+    manifest = read_manifest(directory)
+    columns = {}
+    for name, dtype in manifest['columns'].items():
+        path = Path(directory) / f"{name}.bin"
+        if manifest['rows'] == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(path, dtype=dtype, mode='r', shape=(manifest['rows'],))
+    return columns
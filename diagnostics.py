@@ -0,0 +1,164 @@
+"""Process-wide runtime measurements shown in the diagnostics panel"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger('predictor.instrumentation')
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of durations with percentile lookups"""
+
+    def __init__(self, window=1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.last_ms = None
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self._samples.append(ms)
+            self.count += 1
+            self.last_ms = ms
+
+    @contextmanager
+    def measure(self):
+        """Time the with-block; the yielded dict gets this call's 'ms'"""
+        timing = {'ms': None}
+        started = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            elapsed = time.perf_counter() - started
+            timing['ms'] = elapsed * 1000
+            self.record(elapsed)
+
+    def percentile(self, q):
+        """Return the q-th percentile in milliseconds, or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = max(0, math.ceil(q / 100 * len(samples)) - 1)
+        return samples[index]
+
+
+class RerunProfile:
+    """Stage timings of one app.py rerun
+
+    lap(stage) attributes the time since the previous lap (or since the
+    profile was created) to stage, so the script is timed with one call
+    after each stage instead of wrapping every block in a with-statement.
+    A disabled profile ignores laps.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.finished = False
+        self.stages = {}
+        self._started = self._last = time.perf_counter()
+
+    def lap(self, stage):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def finish(self):
+        self.finished = True
+
+    @property
+    def total_ms(self):
+        return (self._last - self._started) * 1000
+
+
+class StageMetrics:
+    """Thread-safe per-stage totals across reruns, exported as Prometheus text"""
+
+    def __init__(self, prefix='predictor_rerun'):
+        self.prefix = prefix
+        self.reruns = 0
+        self._seconds = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def observe(self, profile):
+        with self._lock:
+            self.reruns += 1
+            for stage, ms in profile.stages.items():
+                self._seconds[stage] = self._seconds.get(stage, 0.0) + ms / 1000
+                self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def mean_ms(self, stage):
+        """Mean milliseconds of stage over the reruns that reached it, or None"""
+        with self._lock:
+            count = self._counts.get(stage)
+            return self._seconds[stage] / count * 1000 if count else None
+
+    def prometheus_text(self):
+        """Counters in the Prometheus text exposition format"""
+        with self._lock:
+            seconds = dict(self._seconds)
+            counts = dict(self._counts)
+            reruns = self.reruns
+        lines = [
+            f"# HELP {self.prefix}s_total Instrumented app.py reruns.",
+            f"# TYPE {self.prefix}s_total counter",
+            f"{self.prefix}s_total {reruns}",
+            f"# HELP {self.prefix}_stage_seconds Time spent in each stage of app.py.",
+            f"# TYPE {self.prefix}_stage_seconds summary",
+        ]
+        for stage in seconds:
+            lines.append(f'{self.prefix}_stage_seconds_sum{{stage="{stage}"}} {seconds[stage]:.6f}')
+            lines.append(f'{self.prefix}_stage_seconds_count{{stage="{stage}"}} {counts[stage]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Atomically write prometheus_text() to path (node_exporter textfile collector)"""
+        path = Path(path)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+        tmp_path.write_text(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+def enable_rerun_logging():
+    """Send rerun log lines to stderr unless the logger already has a handler"""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def log_rerun(profile, **fields):
+    """Emit one structured JSON log line with the stage timings of a rerun"""
+    logger.info(json.dumps({
+        'event': 'rerun',
+        'total_ms': round(profile.total_ms, 3),
+        'stages': {stage: round(ms, 3) for stage, ms in profile.stages.items()},
+        **fields,
+    }))
+
+
+# Model time of interactive predictions across all sessions
+prediction_latency = LatencyTracker()
+# Per-stage rerun times across all sessions (only instrumented reruns)
+rerun_metrics = StageMetrics()
+
+
+def report_rerun(profile, metrics_file=None, **fields):
+    """Add an instrumented rerun to rerun_metrics, log it and rewrite metrics_file if given"""
+    rerun_metrics.observe(profile)
+    enable_rerun_logging()
+    log_rerun(profile, **fields)
+    if metrics_file:
+        rerun_metrics.write_prometheus(metrics_file)
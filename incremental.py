@@ -0,0 +1,139 @@
+"""Incremental rescoring: only customers whose inputs or model changed are scored
+
+Usage:
+    python incremental.py customers.csv scored-2026-10-18/                              # first run: scores everyone
+    python incremental.py customers.csv scored-2026-10-19/ --previous scored-2026-10-18/
+
+The output is a raw columnar directory (see columnar.py) with an extra
+uint64 input_hash column: a hash of each customer's four inputs. With
+--previous, each input row is matched to the previous output by integer
+customer_id; rows with the same input_hash under the same model version
+take their score, tier and contributions from the memory-mapped previous
+columns, and only new or changed rows go through the model. Customers
+missing from the input are dropped. Reading and hashing the input is still
+linear in its size; the model work scales with the amount of change.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bulk_score import DEFAULT_CHUNK_SIZE, iter_chunks, report_progress
+from columnar import CONTRIBUTION_COLUMNS, ID_COLUMN, TIER_COLUMN, RawColumnWriter, read_columnar, read_manifest, score_columns
+from scoring import FEATURES, SCORE_COLUMN, load_model, make_rng
+from settings import settings, resolve_path
+
+HASH_COLUMN = 'input_hash'
+
+
+def input_hashes(chunk):
+    """Stable uint64 hash of each row's FEATURES, independent of the column dtypes"""
+    return pd.util.hash_pandas_object(chunk[FEATURES].astype(np.float64), index=False).to_numpy()
+
+
+class PreviousOutput:
+    """Previous incremental output, indexed by customer_id for vectorized lookups"""
+
+    def __init__(self, directory, model_version):
+        manifest = read_manifest(directory)
+        self.columns = read_columnar(directory)
+        for column in (ID_COLUMN, HASH_COLUMN):
+            if column not in self.columns:
+                raise ValueError(f"{directory} has no {column} column; it was not written by incremental.py")
+        self.same_model = manifest['model_version'] == model_version
+        self._order = np.argsort(self.columns[ID_COLUMN], kind='stable')
+        self._sorted_ids = np.asarray(self.columns[ID_COLUMN])[self._order]
+
+    def match(self, ids, hashes):
+        """Row positions in the previous output and a mask of rows that can be reused"""
+        if not self.same_model or not len(self._sorted_ids):
+            return np.zeros(len(ids), dtype=np.intp), np.zeros(len(ids), dtype=bool)
+        slots = np.minimum(np.searchsorted(self._sorted_ids, ids), len(self._sorted_ids) - 1)
+        positions = self._order[slots]
+        found = self._sorted_ids[slots] == ids
+        reusable = found & (np.asarray(self.columns[HASH_COLUMN])[positions] == hashes)
+        return positions, reusable
+
+
+def rescore_chunk(chunk, model, previous=None, rng=None, explain=False):
+    """Typed columns for one chunk, reusing previous results for unchanged rows
+
+    Returns the columns and the number of reused rows.
+    """
+    if ID_COLUMN not in chunk.columns or not pd.api.types.is_integer_dtype(chunk[ID_COLUMN]):
+        raise ValueError(f"Incremental scoring needs an integer {ID_COLUMN} column")
+    ids = chunk[ID_COLUMN].to_numpy()
+    hashes = input_hashes(chunk)
+    if previous is None:
+        positions, reusable = np.zeros(len(chunk), dtype=np.intp), np.zeros(len(chunk), dtype=bool)
+    else:
+        positions, reusable = previous.match(ids, hashes)
+
+    changed = ~reusable
+    fresh = score_columns(chunk[changed], model, rng, explain)
+    columns = {ID_COLUMN: ids, HASH_COLUMN: hashes}
+    for name in [SCORE_COLUMN, TIER_COLUMN] + (CONTRIBUTION_COLUMNS if explain else []):
+        values = np.empty(len(chunk), dtype=fresh[name].dtype)
+        values[changed] = fresh[name]
+        if reusable.any():
+            if name in previous.columns:
+                values[reusable] = previous.columns[name][positions[reusable]]
+            else:
+                # Contributions are noise-free, so they can be computed for reused rows
+                values[reusable] = score_columns(chunk[reusable], model, explain=True)[name]
+        columns[name] = values
+    return columns, int(reusable.sum())
+
+
+def run(input_path, output_path, model, previous_path=None, chunk_size=DEFAULT_CHUNK_SIZE, rng=None, explain=False,
+        quiet=False):
+    """Write an incremental columnar output and return (rows, reused rows)"""
+    previous = PreviousOutput(previous_path, model.version) if previous_path else None
+    rows = reused = 0
+    started = time.perf_counter()
+    with RawColumnWriter(output_path, model.version) as writer:
+        for chunk in iter_chunks(input_path, chunk_size):
+            columns, chunk_reused = rescore_chunk(chunk, model, previous, rng, explain)
+            writer.write(columns)
+            rows += len(chunk)
+            reused += chunk_reused
+            if not quiet:
+                report_progress(rows, started)
+    if not quiet:
+        report_progress(rows, started, final=True)
+    return rows, reused
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rescore only customers whose inputs or model changed")
+    parser.add_argument('input', help="CSV or Parquet file with customer_id, age, income, membership_years and purchase_frequency columns")
+    parser.add_argument('output', help="Directory for the new columnar output")
+    parser.add_argument('--previous', help="Columnar output of the previous incremental run")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk (default: %(default)s)")
+    parser.add_argument('--model', default=str(resolve_path(settings['modelPath'])), help="Model artifact from train_model.py (mock coefficients if missing)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed the noise for reproducible output")
+    parser.add_argument('--no-noise', action='store_true', help="Score without noise (deterministic output)")
+    parser.add_argument('--explain', action='store_true', help="Add per-feature contribution columns (percent of score)")
+    parser.add_argument('--quiet', action='store_true', help="Do not report progress")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    if args.previous and Path(args.previous).resolve() == Path(args.output).resolve():
+        parser.error("--previous must be a different directory from the output")
+    rng = None if args.no_noise else make_rng(args.seed)
+
+    model = load_model(args.model)
+    try:
+        rows, reused = run(args.input, args.output, model, args.previous, args.chunk_size, rng, args.explain, args.quiet)
+    except (KeyError, ValueError, FileNotFoundError) as exc:
+        sys.exit(f"Error: {exc}")
+    if not args.quiet:
+        print(f"{reused:,} of {rows:,} rows reused, {rows - reused:,} scored with {model.version}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Precomputed noise-free scores for every input the sidebar can produce
+
+Usage:
+    python lookup_table.py               # build the table for model.npz (or the mock model)
+    python lookup_table.py --model other.npz --output-dir lookup_tables
+
+The sidebar limits age to 18-70, income to steps of 5000 up to 500000,
+membership years to 0-20 and purchase frequency to 0-100, a grid of about
+11.4M points. Scores are stored as uint16 hundredths of a point (exact for
+the two-decimal scores) in a .npy file that is memory-mapped read-only, so
+every worker process shares the same pages of the OS page cache.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+
+from scoring import AGE_MAX, AGE_MIN, FREQUENCY_MAX, INCOME_MAX, INCOME_STEP, MEMBERSHIP_MAX, load_model
+from settings import settings, resolve_path
+
+GRID_SHAPE = (
+    AGE_MAX - AGE_MIN + 1,
+    INCOME_MAX // INCOME_STEP + 1,
+    MEMBERSHIP_MAX + 1,
+    FREQUENCY_MAX + 1,
+)
+SCALE = 100
+
+
+def table_path(directory, model):
+    """Tables are per model version so a retrained model never reads stale scores"""
+    return Path(directory) / f"{model.version}.npy"
+
+
+def build_lookup_table(model, path):
+    """Score the whole grid without noise and write it to path as uint16"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f'.tmp{os.getpid()}.npy')
+
+    table = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.uint16, shape=GRID_SHAPE)
+    income, membership_years, purchase_frequency = np.meshgrid(
+        np.arange(GRID_SHAPE[1]) * INCOME_STEP,
+        np.arange(GRID_SHAPE[2]),
+        np.arange(GRID_SHAPE[3]),
+        indexing='ij',
+    )
+    # One age slice (~214k points) at a time keeps memory use small
+    for i in range(GRID_SHAPE[0]):
+        age = np.full(income.shape, AGE_MIN + i)
+        scores = model.predict_batch(age, income, membership_years, purchase_frequency)
+        table[i] = np.rint(scores * SCALE)
+    table.flush()
+    del table
+
+    # Atomic rename so concurrent workers never map a half-written table
+    os.replace(tmp_path, path)
+    return path
+
+
+class LookupTable:
+    """Read-only memory-mapped score table answering grid inputs with one index"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.table = np.load(self.path, mmap_mode='r')
+        if self.table.shape != GRID_SHAPE:
+            raise ValueError(f"{self.path} has shape {self.table.shape}, expected {GRID_SHAPE}")
+
+    @classmethod
+    def load_or_build(cls, directory, model):
+        path = table_path(directory, model)
+        if not path.exists():
+            build_lookup_table(model, path)
+        return cls(path)
+
+    def get(self, age, income, membership_years, purchase_frequency):
+        """Return the precomputed score, or None for inputs off the grid"""
+        if not (
+            AGE_MIN <= age <= AGE_MAX
+            and 0 <= income <= INCOME_MAX and income % INCOME_STEP == 0
+            and 0 <= membership_years <= MEMBERSHIP_MAX
+            and 0 <= purchase_frequency <= FREQUENCY_MAX
+        ):
+            return None
+        value = self.table[int(age) - AGE_MIN, int(income) // INCOME_STEP, int(membership_years), int(purchase_frequency)]
+        return int(value) / SCALE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute noise-free scores for the whole input grid")
+    parser.add_argument('--model', default=str(resolve_path(settings['modelPath'])), help="Model artifact (mock coefficients if missing)")
+    parser.add_argument('--output-dir', default=str(resolve_path(settings['lookupTableDir'])), help="Directory for <model version>.npy tables")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    path = build_lookup_table(model, table_path(args.output_dir, model))
+    print(f"Wrote {np.prod(GRID_SHAPE):,} scores for {model.version} to {path} ({path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""Multi-process bulk scoring for large CSV and Parquet files
+
+Usage:
+    python parallel_score.py customers.csv scored.csv --workers 8
+    python parallel_score.py customers.parquet scored.parquet --segments segments.json
+
+The input is split into parts of about PART_BYTES: newline-aligned byte
+ranges for CSV, runs of row groups for Parquet. A process pool scores the
+parts with the same chunked pipeline as bulk_score.py, each part going to its
+own temporary file, and the parts are then concatenated in input order. CSV
+splitting assumes no quoted field contains a newline.
+
+Without noise the output equals bulk_score.py's. With --seed each part draws
+from its own stream, so the output is the same for any --workers but not the
+same as bulk_score.py's single stream.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bulk_score import DEFAULT_CHUNK_SIZE, ChunkWriter, file_format, report_progress, score_chunk
+from columnar import require_pyarrow
+from scoring import SCORE_COLUMN, load_model
+from segments import SegmentStats
+from settings import settings, resolve_path
+from translations import translations
+
+# Input bytes per part. Parts depend only on the file, never on the worker
+# count, so each part's seeded noise stream is the same with any --workers
+PART_BYTES = 8 * 1024 * 1024
+
+
+class ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of a file"""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._file.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def csv_parts(path, part_bytes=PART_BYTES):
+    """Split a CSV after its header into newline-aligned byte ranges of about part_bytes"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        boundaries = [data_start]
+        for target in range(data_start + part_bytes, size, part_bytes):
+            if target <= boundaries[-1]:
+                continue
+            f.seek(target)
+            f.readline()
+            if f.tell() >= size:
+                break
+            if f.tell() > boundaries[-1]:
+                boundaries.append(f.tell())
+        boundaries.append(size)
+    columns = next(csv.reader([header.decode('utf-8-sig')]))
+    return columns, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def parquet_parts(path, part_bytes=PART_BYTES):
+    """Split a Parquet file's row groups into contiguous lists of about part_bytes (uncompressed)"""
+    pq = require_pyarrow()
+    metadata = pq.ParquetFile(path).metadata
+    parts, part, part_size = [], [], 0
+    for i in range(metadata.num_row_groups):
+        part.append(i)
+        part_size += metadata.row_group(i).total_byte_size
+        if part_size >= part_bytes:
+            parts.append(part)
+            part, part_size = [], 0
+    if part:
+        parts.append(part)
+    return parts
+
+
+def _iter_part_chunks(input_path, part, columns, chunk_size):
+    if columns is None:
+        pq = require_pyarrow()
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_size, row_groups=part):
+            yield batch.to_pandas()
+    else:
+        start, end = part
+        with io.BufferedReader(ByteRange(input_path, start, end)) as f:
+            yield from pd.read_csv(f, names=columns, header=None, chunksize=chunk_size)
+
+
+def score_part(input_path, part, columns, part_path, model, language, seed, explain, chunk_size, collect_segments):
+    """Score one part into part_path; returns (rows, segment stats dict or None)"""
+    rng = None if seed is None else np.random.default_rng(seed)
+    segments = SegmentStats() if collect_segments else None
+    rows = 0
+    with ChunkWriter(part_path) as writer:
+        for chunk in _iter_part_chunks(input_path, part, columns, chunk_size):
+            chunk = score_chunk(chunk, model, language, rng, explain)
+            if segments is not None:
+                segments.update(chunk[SCORE_COLUMN].to_numpy(), chunk['income'].to_numpy(), chunk['membership_years'].to_numpy())
+            writer.write(chunk)
+            rows += len(chunk)
+    return rows, segments.to_dict() if segments is not None else None
+
+
+def concatenate_parts(part_paths, output_path):
+    """Join the part files into output_path in order
+
+    Parquet parts are cast to one schema, widening a column to double where
+    parts inferred different numeric types.
+    """
+    if file_format(output_path) == 'parquet':
+        pq = require_pyarrow()
+        import pyarrow as pa
+
+        part_paths = [part_path for part_path in part_paths if part_path.exists()]
+        if not part_paths:
+            return
+        schema = pa.unify_schemas([pq.read_schema(part_path) for part_path in part_paths], promote_options='permissive')
+        writer = pq.ParquetWriter(output_path, schema)
+        try:
+            for part_path in part_paths:
+                part = pq.ParquetFile(part_path)
+                for i in range(part.num_row_groups):
+                    writer.write_table(part.read_row_group(i).cast(schema))
+        finally:
+            writer.close()
+        return
+
+    with open(output_path, 'wb') as output:
+        header_written = False
+        for part_path in part_paths:
+            if not part_path.exists():
+                continue
+            with open(part_path, 'rb') as part:
+                header = part.readline()
+                if not header_written:
+                    output.write(header)
+                    header_written = True
+                shutil.copyfileobj(part, output, 1024 * 1024)
+
+
+def run(input_path, output_path, model, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, language='en', seed=None,
+        noise=True, explain=False, segments=None, quiet=False, part_bytes=PART_BYTES):
+    """Score input_path into output_path with a pool of worker processes; returns the row count"""
+    workers = workers or os.cpu_count() or 1
+    file_format(output_path)
+    if file_format(input_path) == 'parquet':
+        columns, parts = None, parquet_parts(input_path, part_bytes)
+    else:
+        columns, parts = csv_parts(input_path, part_bytes)
+
+    # Independent, reproducible noise stream per part, whatever the worker count
+    seeds = np.random.SeedSequence(seed).spawn(len(parts)) if noise else [None] * len(parts)
+    suffix = Path(output_path).suffix
+
+    rows = 0
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=Path(output_path).resolve().parent) as tmp_dir:
+        part_paths = [Path(tmp_dir) / f"part-{i:05d}{suffix}" for i in range(len(parts))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(score_part, input_path, part, columns, part_path, model, language, part_seed,
+                            explain, chunk_size, segments is not None)
+                for part, part_path, part_seed in zip(parts, part_paths, seeds)
+            ]
+            for future in futures:
+                part_rows, part_segments = future.result()
+                rows += part_rows
+                if segments is not None:
+                    segments.merge(SegmentStats.from_dict(part_segments))
+                if not quiet:
+                    report_progress(rows, started)
+        concatenate_parts(part_paths, output_path)
+
+    if not quiet:
+        report_progress(rows, started, final=True)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a large customer file on all CPU cores")
+    parser.add_argument('input', help="CSV or Parquet file with age, income, membership_years and purchase_frequency columns")
+    parser.add_argument('output', help="CSV or Parquet file to write")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk within a worker (default: %(default)s)")
+    parser.add_argument('--language', choices=sorted(translations), default='en', help="Language of the customer category column")
+    parser.add_argument('--model', default=str(resolve_path(settings['modelPath'])), help="Model artifact from train_model.py (mock coefficients if missing)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed the noise for reproducible output")
+    parser.add_argument('--no-noise', action='store_true', help="Score without noise (deterministic output)")
+    parser.add_argument('--explain', action='store_true', help="Add per-feature contribution columns (percent of score)")
+    parser.add_argument('--segments', help="Write per-tier statistics (counts, means, score histograms) to this JSON file")
+    parser.add_argument('--quiet', action='store_true', help="Do not report progress")
+    args = parser.parse_args(argv)
+
+    if args.workers <= 0 or args.chunk_size <= 0:
+        parser.error("--workers and --chunk-size must be positive")
+
+    segments = SegmentStats() if args.segments else None
+    try:
+        run(args.input, args.output, load_model(args.model), args.workers, args.chunk_size, args.language,
+            args.seed, not args.no_noise, args.explain, segments, args.quiet)
+    except (KeyError, ValueError) as exc:
+        sys.exit(f"Error: {exc}")
+
+    if segments is not None:
+        Path(args.segments).write_text(json.dumps(segments.summary(args.language), indent=2, ensure_ascii=False), encoding='utf-8')
+        if segments.unscored:
+            print(f"{segments.unscored:,} rows with missing inputs are left out of the segment statistics", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
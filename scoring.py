@@ -0,0 +1,232 @@
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+
+from translations import translations
+
+# Input columns expected by the batch scoring functions
+FEATURES = ['age', 'income', 'membership_years', 'purchase_frequency']
+SCORE_COLUMN = 'spending_score'
+
+# Input grid of the sidebar, shared by the lookup table and the sensitivity sweeps
+AGE_MIN, AGE_MAX = 18, 70
+INCOME_STEP, INCOME_MAX = 5000, 500000
+MEMBERSHIP_MAX = 20
+FREQUENCY_MAX = 100
+
+# Mock Linear Regression coefficients, used when no trained model artifact exists
+BASE_SCORE = 10
+INCOME_CAP = 200000
+AGE_WEIGHT = 15
+INCOME_WEIGHT = 35
+MEMBERSHIP_WEIGHT = 20
+FREQUENCY_WEIGHT = 30
+NOISE_STD = 2
+
+MODEL_PATH = Path(__file__).with_name('model.npz')
+
+# Customer tiers used by get_recommendation
+HIGH_VALUE_THRESHOLD = 70
+MEDIUM_VALUE_THRESHOLD = 40
+TIER_LOW, TIER_MEDIUM, TIER_HIGH = 0, 1, 2
+TIER_KEYS = ('low_value', 'medium_value', 'high_value')
+TIER_CLASSES = ('low-value', 'medium-value', 'high-value')
+TIER_EMOJIS = ('🔍', '💡', '🎯')
+
+
+class SpendingModel:
+    """Linear spending score model over normalised inputs
+
+    Each input is normalised as (x - lower) / (upper - lower), capped at
+    `cap`, multiplied by its weight and added to the intercept. Gaussian
+    noise with `noise_std` is added and the score is clipped to 0-100.
+    """
+
+    def __init__(self, weights, intercept, lower, upper, cap, noise_std=NOISE_STD, version='mock-v1'):
+        self.weights = tuple(float(w) for w in weights)
+        self.intercept = float(intercept)
+        self.lower = tuple(float(v) for v in lower)
+        self.upper = tuple(float(v) for v in upper)
+        self.cap = tuple(float(v) for v in cap)
+        self.noise_std = float(noise_std)
+        self.version = str(version)
+
+    @classmethod
+    def load(cls, path):
+        """Load a model saved with save() (see train_model.py)"""
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                weights=artifact['weights'],
+                intercept=artifact['intercept'],
+                lower=artifact['lower'],
+                upper=artifact['upper'],
+                cap=artifact['cap'],
+                noise_std=artifact['noise_std'],
+                version=artifact['version'][()],
+            )
+
+    def save(self, path):
+        """Save the coefficients and normalisation bounds as a compact .npz"""
+        np.savez(
+            path,
+            weights=np.array(self.weights),
+            intercept=np.array(self.intercept),
+            lower=np.array(self.lower),
+            upper=np.array(self.upper),
+            cap=np.array(self.cap),
+            noise_std=np.array(self.noise_std),
+            version=np.array(self.version),
+        )
+
+    def predict(self, age, income, membership_years, purchase_frequency, rng=None):
+        """Predict one spending score (0-100) from Python scalars
+
+        Noise is drawn from the numpy.random.Generator `rng`; without one the
+        score is deterministic.
+        """
+        score = self.intercept
+        for value, weight, lower, upper, cap in zip(
+            (age, income, membership_years, purchase_frequency),
+            self.weights, self.lower, self.upper, self.cap
+        ):
+            score = score + min((value - lower) / (upper - lower), cap) * weight
+
+        if rng is not None and self.noise_std:
+            noise = rng.normal(0, self.noise_std)
+            score = score + noise
+        score = max(0, min(100, score))
+
+        return float(np.round(score, 2))
+
+    def predict_batch(self, age, income, membership_years, purchase_frequency, rng=None, noise=None):
+        """Vectorized predict over equal-length arrays
+
+        Scalars broadcast against the arrays; all-scalar inputs give a
+        one-element array. Noise is drawn from `rng` as one vector and the terms are summed in
+        the same order as predict(), so with generators seeded alike the
+        result matches predict() row by row. `noise` instead adds pre-drawn
+        per-row noise, e.g. drawn by each caller from its own generator.
+        """
+        score = None
+        for value, weight, lower, upper, cap in zip(
+            (age, income, membership_years, purchase_frequency),
+            self.weights, self.lower, self.upper, self.cap
+        ):
+            norm = np.minimum((np.atleast_1d(np.asarray(value, dtype=np.float64)) - lower) / (upper - lower), cap)
+            score = self.intercept + norm * weight if score is None else score + norm * weight
+
+        if noise is not None:
+            score = score + noise
+        elif rng is not None and self.noise_std:
+            score += rng.normal(0, self.noise_std, size=score.shape)
+        np.clip(score, 0, 100, out=score)
+
+        return np.round(score, 2, out=score)
+
+    def contributions(self, age, income, membership_years, purchase_frequency):
+        """Weight x normalised value of each feature, as an (n, 4) array"""
+        values = [np.atleast_1d(np.asarray(value, dtype=np.float64))
+                  for value in (age, income, membership_years, purchase_frequency)]
+        terms = np.empty((len(values[0]), len(FEATURES)))
+        for i, (value, weight, lower, upper, cap) in enumerate(zip(
+            values, self.weights, self.lower, self.upper, self.cap
+        )):
+            np.multiply(np.minimum((value - lower) / (upper - lower), cap), weight, out=terms[:, i])
+        return terms
+
+    def contribution_shares(self, age, income, membership_years, purchase_frequency):
+        """Each feature's contribution as a percentage of the noise-free score"""
+        terms = self.contributions(age, income, membership_years, purchase_frequency)
+        base_scores = self.intercept + terms.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = np.where(base_scores != 0, terms / base_scores * 100, 0.0)
+        return shares
+
+
+MOCK_MODEL = SpendingModel(
+    weights=(AGE_WEIGHT, INCOME_WEIGHT, MEMBERSHIP_WEIGHT, FREQUENCY_WEIGHT),
+    intercept=BASE_SCORE,
+    lower=(AGE_MIN, 0, 0, 0),
+    upper=(AGE_MAX, INCOME_CAP, MEMBERSHIP_MAX, FREQUENCY_MAX),
+    cap=(np.inf, 1.0, np.inf, np.inf),
+)
+
+
+def make_rng(seed=None):
+    """Create the noise generator for one session or batch (seeded if given)"""
+    return np.random.default_rng(seed)
+
+
+def load_model(path=MODEL_PATH):
+    """Load the trained model artifact, falling back to the mock coefficients"""
+    if path and Path(path).exists():
+        return SpendingModel.load(path)
+    return MOCK_MODEL
+
+
+def predict_spending_score(age, income, membership_years, purchase_frequency, model=MOCK_MODEL, rng=None):
+    """Predict one spending score (0-100), with noise from rng if given"""
+    return model.predict(age, income, membership_years, purchase_frequency, rng)
+
+
+def predict_spending_scores(age, income, membership_years, purchase_frequency, model=MOCK_MODEL, rng=None):
+    """Vectorized predict_spending_score over equal-length arrays (or scalars, giving one score)"""
+    return model.predict_batch(age, income, membership_years, purchase_frequency, rng)
+
+
+def score_dataframe(df, model=MOCK_MODEL, rng=None):
+    """Score a DataFrame with the FEATURES columns and return the score column"""
+    missing = [column for column in FEATURES if column not in df.columns]
+    if missing:
+        raise KeyError(f"Missing input columns: {', '.join(missing)}")
+
+    import pandas as pd
+
+    scores = model.predict_batch(*(df[column].to_numpy() for column in FEATURES), rng=rng)
+    return pd.Series(scores, index=df.index, name=SCORE_COLUMN)
+
+
+def score_tiers(scores):
+    """Vectorized tier codes (TIER_LOW/MEDIUM/HIGH) for an array of scores"""
+    scores = np.asarray(scores)
+    tiers = np.full(scores.shape, TIER_LOW, dtype=np.uint8)
+    tiers[scores >= MEDIUM_VALUE_THRESHOLD] = TIER_MEDIUM
+    tiers[scores >= HIGH_VALUE_THRESHOLD] = TIER_HIGH
+    return tiers
+
+
+def score_tier(score):
+    """Tier code (TIER_LOW/MEDIUM/HIGH) of one score"""
+    if score >= HIGH_VALUE_THRESHOLD:
+        return TIER_HIGH
+    if score >= MEDIUM_VALUE_THRESHOLD:
+        return TIER_MEDIUM
+    return TIER_LOW
+
+
+@lru_cache(maxsize=None)
+def recommendation_payloads(language):
+    """Read-only recommendation payload of each tier in a language, indexed by tier code"""
+    t = translations[language]
+    payloads = []
+    for tier, prefix in enumerate(('low', 'medium', 'high')):
+        payloads.append(MappingProxyType({
+            'category': t[TIER_KEYS[tier]],
+            'recommendation': t[f"{prefix}_value_rec"],
+            'actions': tuple(t[f"{prefix}_rec_{i}"] for i in range(1, 6)),
+            'class': TIER_CLASSES[tier],
+            'emoji': TIER_EMOJIS[tier],
+        }))
+    return tuple(payloads)
+
+
+def tier_labels(language):
+    """Localised category of each tier, indexed by tier code"""
+    return tuple(payload['category'] for payload in recommendation_payloads(language))
+
+
+def get_recommendation(score, language='en'):
+    """Business recommendation for a spending score (shared, read-only payload)"""
+    return recommendation_payloads(language)[score_tier(score)]
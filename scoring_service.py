@@ -0,0 +1,226 @@
+"""Headless JSON scoring service sharing the model and tiering of app.py
+
+Usage:
+    python scoring_service.py --port 8080 --workers 4
+
+Endpoints:
+    GET  /health        model version and status
+    POST /score         one customer object, a list of customers, or {"customers": [...]}
+    POST /score/bulk    newline-delimited JSON, one customer per line (like requests.jsonl);
+                        answered with one JSON line per input line
+
+Add ?language=ar for Arabic categories. Each worker is a separate process
+running an aiohttp event loop on the same port (SO_REUSEPORT), so requests
+are spread across cores. Streamlit, Plotly and the UI CSS are never imported.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+from scoring import FEATURES, SCORE_COLUMN, TIER_CLASSES, get_recommendation, load_model, make_rng, score_tiers, tier_labels
+from settings import settings, resolve_path
+from translations import translations
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+ID_FIELDS = ('request_id', 'id', 'customer_id')
+BULK_BATCH_SIZE = 10000
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def validate_customer(customer):
+    """Raise BadRequest unless customer is an object with finite numeric FEATURES"""
+    if not isinstance(customer, dict):
+        raise BadRequest("Expected a customer object")
+    for name in FEATURES:
+        if name not in customer:
+            raise BadRequest(f"Missing field: {name}")
+        value = customer[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise BadRequest(f"Field {name} must be a number")
+        # json accepts NaN and Infinity, which would make the response invalid JSON
+        try:
+            finite = math.isfinite(value)
+        except OverflowError:
+            finite = False
+        if not finite:
+            raise BadRequest(f"Field {name} must be a finite number")
+
+
+def customer_arrays(customers):
+    """Turn a list of customer objects into one float64 array per feature"""
+    if not customers:
+        raise BadRequest("No customers given")
+    try:
+        return [np.array([customer[name] for customer in customers], dtype=np.float64) for name in FEATURES]
+    except KeyError as exc:
+        raise BadRequest(f"Missing field: {exc.args[0]}")
+    except (TypeError, ValueError):
+        raise BadRequest(f"Fields {', '.join(FEATURES)} must be numbers")
+
+
+def batch_results(scores, language, customers=None):
+    """Compact per-row results: score, tier class and localised category"""
+    categories = tier_labels(language)
+    results = []
+    for i, (score, tier) in enumerate(zip(scores.tolist(), score_tiers(scores).tolist())):
+        result = {SCORE_COLUMN: score, 'tier': TIER_CLASSES[tier], 'category': categories[tier]}
+        if customers is not None:
+            for field in ID_FIELDS:
+                if field in customers[i]:
+                    result[field] = customers[i][field]
+                    break
+        results.append(result)
+    return results
+
+
+class ScoringService:
+    def __init__(self, model, rng=None):
+        self.model = model
+        self.rng = rng
+
+    def language(self, request):
+        language = request.query.get('language', 'en')
+        if language not in translations:
+            raise BadRequest(f"Unsupported language: {language}")
+        return language
+
+    def score(self, customers):
+        return self.model.predict_batch(*customer_arrays(customers), rng=self.rng)
+
+    async def health(self, request):
+        return web.json_response({'status': 'ok', 'model_version': self.model.version})
+
+    async def score_json(self, request):
+        try:
+            language = self.language(request)
+            try:
+                payload = await request.json()
+            except ValueError:
+                raise BadRequest("Body must be JSON")
+
+            if isinstance(payload, dict) and 'customers' not in payload:
+                # Single customer: full recommendation like the UI shows
+                validate_customer(payload)
+                score = float(self.score([payload])[0])
+                recommendation = get_recommendation(score, language)
+                return web.json_response({SCORE_COLUMN: score, 'model_version': self.model.version, **recommendation})
+
+            customers = payload['customers'] if isinstance(payload, dict) else payload
+            if not isinstance(customers, list) or not all(isinstance(c, dict) for c in customers):
+                raise BadRequest("Expected a customer object or a list of customer objects")
+            for index, customer in enumerate(customers):
+                try:
+                    validate_customer(customer)
+                except BadRequest as exc:
+                    raise BadRequest(f"Customer {index}: {exc}")
+            return web.json_response({
+                'model_version': self.model.version,
+                'results': batch_results(self.score(customers), language, customers),
+            })
+        except BadRequest as exc:
+            return web.json_response({'error': str(exc)}, status=400)
+
+    async def score_bulk(self, request):
+        try:
+            language = self.language(request)
+        except BadRequest as exc:
+            return web.json_response({'error': str(exc)}, status=400)
+
+        response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+        await response.prepare(request)
+
+        batch = []
+        line_number = 0
+        async for line in request.content:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                try:
+                    customer = json.loads(line)
+                except ValueError:
+                    raise BadRequest("Invalid JSON")
+                validate_customer(customer)
+            except BadRequest as exc:
+                # Keep output lines in input order
+                await self._flush(response, batch, language)
+                batch = []
+                await response.write(json.dumps({'line': line_number, 'error': str(exc)}).encode() + b'\n')
+                continue
+            batch.append(customer)
+            if len(batch) >= BULK_BATCH_SIZE:
+                await self._flush(response, batch, language)
+                batch = []
+
+        await self._flush(response, batch, language)
+        await response.write_eof()
+        return response
+
+    async def _flush(self, response, batch, language):
+        if not batch:
+            return
+        lines = [json.dumps(result, ensure_ascii=False) for result in batch_results(self.score(batch), language, batch)]
+        await response.write(('\n'.join(lines) + '\n').encode())
+
+
+def create_app(model, rng=None):
+    service = ScoringService(model, rng)
+    app = web.Application(client_max_size=256 * 1024 ** 2)
+    app.router.add_get('/health', service.health)
+    app.router.add_post('/score', service.score_json)
+    app.router.add_post('/score/bulk', service.score_bulk)
+    return app
+
+
+def serve(host, port, model_path, noise, reuse_port):
+    model = load_model(model_path)
+    rng = make_rng() if noise else None
+    web.run_app(create_app(model, rng), host=host, port=port, reuse_port=reuse_port,
+                print=lambda message: print(f"[worker {os.getpid()}] {message}", file=sys.stderr))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON scoring service for the spending score model")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--model', default=str(resolve_path(settings['modelPath'])), help="Model artifact (mock coefficients if missing)")
+    parser.add_argument('--noise', action='store_true', default=settings['noise'], help="Add model noise to scores (default from predictor.toml)")
+    parser.add_argument('--no-noise', action='store_false', dest='noise', help="Deterministic scores")
+    args = parser.parse_args(argv)
+
+    if web is None:
+        sys.exit("The scoring service requires aiohttp: pip install aiohttp")
+
+    if args.workers <= 1:
+        serve(args.host, args.port, args.model, args.noise, reuse_port=False)
+        return
+
+    workers = [
+        multiprocessing.Process(target=serve, args=(args.host, args.port, args.model, args.noise, True))
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == '__main__':
+    main()
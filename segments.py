@@ -0,0 +1,111 @@
+"""Per-tier statistics over scored customer populations
+
+SegmentStats is filled one chunk at a time with running sums and a score
+histogram per tier, so a population of any size is summarised in a single
+pass. Stats from different chunks, files or worker processes are combined
+with merge(), and to_dict()/from_dict() move them between processes as JSON.
+Rows without a finite score (a missing input) are only counted as unscored.
+"""
+import numpy as np
+
+from scoring import TIER_KEYS, score_tiers
+from translations import translations
+
+HISTOGRAM_BINS = 20
+
+
+class SegmentStats:
+    """Mergeable counts, income/loyalty/score sums and score histograms per tier"""
+
+    def __init__(self, bins=HISTOGRAM_BINS):
+        tiers = len(TIER_KEYS)
+        self.bins = bins
+        self.count = np.zeros(tiers, dtype=np.int64)
+        self.income_sum = np.zeros(tiers)
+        self.membership_sum = np.zeros(tiers)
+        self.score_sum = np.zeros(tiers)
+        self.histogram = np.zeros((tiers, bins), dtype=np.int64)
+        self.unscored = 0
+
+    def update(self, scores, income, membership_years, tiers=None):
+        """Add one chunk of scored customers"""
+        scores = np.asarray(scores, dtype=np.float64)
+        finite = np.isfinite(scores)
+        if not finite.all():
+            self.unscored += int(len(scores) - finite.sum())
+            scores = scores[finite]
+            income = np.asarray(income)[finite]
+            membership_years = np.asarray(membership_years)[finite]
+            if tiers is not None:
+                tiers = np.asarray(tiers)[finite]
+        if tiers is None:
+            tiers = score_tiers(scores)
+        tiers = np.asarray(tiers, dtype=np.intp)
+        n_tiers = len(TIER_KEYS)
+
+        self.count += np.bincount(tiers, minlength=n_tiers)
+        self.income_sum += np.bincount(tiers, weights=np.asarray(income, dtype=np.float64), minlength=n_tiers)
+        self.membership_sum += np.bincount(tiers, weights=np.asarray(membership_years, dtype=np.float64), minlength=n_tiers)
+        self.score_sum += np.bincount(tiers, weights=scores, minlength=n_tiers)
+
+        # Scores are 0-100; a score of exactly 100 goes into the last bin
+        score_bins = np.minimum((scores * self.bins / 100).astype(np.intp), self.bins - 1)
+        self.histogram += np.bincount(tiers * self.bins + score_bins, minlength=n_tiers * self.bins).reshape(n_tiers, self.bins)
+        return self
+
+    def merge(self, other):
+        """Add the statistics of another SegmentStats in place"""
+        if other.bins != self.bins:
+            raise ValueError(f"Cannot merge histograms with {other.bins} and {self.bins} bins")
+        self.count += other.count
+        self.income_sum += other.income_sum
+        self.membership_sum += other.membership_sum
+        self.score_sum += other.score_sum
+        self.histogram += other.histogram
+        self.unscored += other.unscored
+        return self
+
+    def summary(self, language='en'):
+        """Per-tier count, share, means and score histogram, highest tier first"""
+        t = translations[language]
+        total = int(self.count.sum())
+        edges = np.linspace(0, 100, self.bins + 1)
+        segments = []
+        for tier in reversed(range(len(TIER_KEYS))):
+            count = int(self.count[tier])
+            segments.append({
+                'tier': TIER_KEYS[tier],
+                'category': t[TIER_KEYS[tier]],
+                'count': count,
+                'share': count / total if total else 0.0,
+                'mean_income': self.income_sum[tier] / count if count else None,
+                'mean_membership_years': self.membership_sum[tier] / count if count else None,
+                'mean_score': self.score_sum[tier] / count if count else None,
+                'histogram': {
+                    'edges': edges.tolist(),
+                    'counts': self.histogram[tier].tolist(),
+                },
+            })
+        return segments
+
+    def to_dict(self):
+        return {
+            'bins': self.bins,
+            'count': self.count.tolist(),
+            'income_sum': self.income_sum.tolist(),
+            'membership_sum': self.membership_sum.tolist(),
+            'score_sum': self.score_sum.tolist(),
+            'histogram': self.histogram.tolist(),
+            'unscored': self.unscored,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data['bins'])
+        stats.count[:] = data['count']
+        stats.income_sum[:] = data['income_sum']
+        stats.membership_sum[:] = data['membership_sum']
+        stats.score_sum[:] = data['score_sum']
+        stats.histogram[:] = data['histogram']
+        stats.unscored = data.get('unscored', 0)
+        return stats
@@ -0,0 +1,36 @@
+"""What-if sweeps of one customer's score over the range of one or two inputs
+
+Every point of the sweep is scored in a single predict_batch call without
+noise, so a 101 x 101 income x frequency grid costs about a millisecond.
+"""
+import numpy as np
+
+from scoring import AGE_MAX, AGE_MIN, FEATURES, FREQUENCY_MAX, INCOME_MAX, INCOME_STEP, MEMBERSHIP_MAX
+
+# The values each sidebar input can take
+FEATURE_GRIDS = {
+    'age': np.arange(AGE_MIN, AGE_MAX + 1),
+    'income': np.arange(0, INCOME_MAX + 1, INCOME_STEP),
+    'membership_years': np.arange(MEMBERSHIP_MAX + 1),
+    'purchase_frequency': np.arange(FREQUENCY_MAX + 1),
+}
+
+
+def sweep(model, inputs, x_feature, y_feature=None):
+    """Noise-free scores for inputs with x_feature (and y_feature) swept over their grids
+
+    Returns the x values and a 1-D score array, or the x values, y values and
+    a (len(y), len(x)) score array when y_feature is given.
+    """
+    if x_feature == y_feature:
+        raise ValueError("Sweep two different inputs")
+    # The fixed inputs stay scalars and broadcast against the swept grid
+    columns = dict(zip(FEATURES, (float(value) for value in inputs)))
+    x_values = FEATURE_GRIDS[x_feature]
+    if y_feature is None:
+        columns[x_feature] = x_values
+        return x_values, model.predict_batch(*(columns[feature] for feature in FEATURES))
+
+    y_values = FEATURE_GRIDS[y_feature]
+    columns[x_feature], columns[y_feature] = np.meshgrid(x_values, y_values)
+    return x_values, y_values, model.predict_batch(*(columns[feature] for feature in FEATURES))
@@ -0,0 +1,187 @@
+"""Compact per-session state and the shared, size-bounded artifact cache
+
+Each Streamlit session keeps one slotted SessionData record in
+st.session_state instead of a dozen separate keys. Anything large, such as
+a scored upload, lives in the process-wide ArtifactCache and the session
+only holds its key; the cache evicts least recently used artifacts past its
+byte budget, and SessionRegistry drops the artifacts of sessions that have
+been idle too long or have ended.
+"""
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict, deque
+
+
+class SessionData:
+    """Everything app.py remembers about one session"""
+
+    __slots__ = (
+        'language', 'theme',
+        'age', 'income', 'membership_years', 'purchase_frequency',
+        'prediction_made', 'predict_requested', 'prediction_inputs', 'score', 'model_ms',
+        'rng', 'batch_job_key', 'session_id', '__weakref__',
+    )
+
+    def __init__(self, rng=None):
+        self.language = 'en'
+        self.theme = 'light'
+        self.age = 35
+        self.income = 50000
+        self.membership_years = 5
+        self.purchase_frequency = 25
+        self.prediction_made = False
+        self.predict_requested = False
+        self.prediction_inputs = None
+        self.score = None
+        self.model_ms = None
+        self.rng = rng
+        self.batch_job_key = None
+        self.session_id = uuid.uuid4().hex
+
+    def footprint(self):
+        """Approximate bytes held by the record and its values"""
+        size = sys.getsizeof(self)
+        for name in self.__slots__[:-1]:
+            value = getattr(self, name)
+            size += sys.getsizeof(value)
+            if isinstance(value, tuple):
+                size += sum(sys.getsizeof(item) for item in value)
+        return size
+
+
+class ArtifactCache:
+    """Thread-safe LRU of large shared artifacts, bounded by their total bytes
+
+    Evicted or discarded artifacts with a cleanup() method (such as
+    batch_scoring.BatchJob) are cleaned up.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, value, nbytes):
+        """Store value and return the key a session should keep instead of it"""
+        key = uuid.uuid4().hex
+        evicted = []
+        with self._lock:
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            # The newest artifact stays even if it alone exceeds the budget
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (old_value, old_nbytes) = self._entries.popitem(last=False)
+                self._bytes -= old_nbytes
+                self.evictions += 1
+                evicted.append(old_value)
+        for old_value in evicted:
+            _cleanup(old_value)
+        return key
+
+    def get(self, key):
+        """The artifact stored under key, or None if it was evicted"""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def nbytes(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry else 0
+
+    def discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+        if entry is not None:
+            _cleanup(entry[0])
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+            }
+
+
+def _cleanup(value):
+    cleanup = getattr(value, 'cleanup', None)
+    if cleanup is not None:
+        cleanup()
+
+
+class SessionRegistry:
+    """Tracks each session's artifact and last activity, and releases stale artifacts
+
+    An artifact is released when its session has been idle for idle_seconds,
+    or as soon as the session's record is garbage-collected, which is what
+    happens once Streamlit drops the state of a closed browser tab.
+    """
+
+    def __init__(self, artifacts, idle_seconds, sweep_interval=60):
+        self.artifacts = artifacts
+        self.idle_seconds = idle_seconds
+        self.sweep_interval = sweep_interval
+        # session_id -> [last_seen, artifact key or None]
+        self._sessions = {}
+        self._closed = deque()
+        self._last_sweep = time.monotonic()
+        self._lock = threading.Lock()
+
+    def touch(self, session):
+        """Mark a session active on this rerun, registering it on first sight"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session.session_id)
+            if entry is not None:
+                entry[0] = now
+                return
+            self._sessions[session.session_id] = [now, session.batch_job_key]
+        # May run inside the garbage collector, so it only queues the id for evict_idle()
+        weakref.finalize(session, self._closed.append, session.session_id)
+
+    def set_artifact(self, session, key):
+        """Make key (or None) the session's artifact, releasing the one it replaces"""
+        self.touch(session)
+        with self._lock:
+            entry = self._sessions[session.session_id]
+            old_key, entry[1] = entry[1], key
+        session.batch_job_key = key
+        if old_key is not None and old_key != key:
+            self.artifacts.discard(old_key)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def evict_idle(self):
+        """Release the artifacts of closed sessions, and of idle ones at most once per sweep_interval"""
+        released = []
+        now = time.monotonic()
+        with self._lock:
+            while self._closed:
+                entry = self._sessions.pop(self._closed.popleft(), None)
+                if entry is not None and entry[1] is not None:
+                    released.append(entry[1])
+            if now - self._last_sweep >= self.sweep_interval:
+                self._last_sweep = now
+                for entry in self._sessions.values():
+                    if entry[1] is not None and now - entry[0] > self.idle_seconds:
+                        released.append(entry[1])
+                        entry[1] = None
+        for key in released:
+            self.artifacts.discard(key)
+        return len(released)
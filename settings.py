@@ -0,0 +1,60 @@
+"""Predictor settings from the [predictor] section of predictor.toml"""
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Kept apart from Streamlit's .streamlit/config.toml, which rejects unknown sections
+CONFIG_PATH = Path(__file__).with_name('predictor.toml')
+
+DEFAULTS = {
+    # p99 budget for the model call behind the Predict button
+    'latencyBudgetMs': 50.0,
+    # Trained model artifact written by train_model.py
+    'modelPath': 'model.npz',
+    # Add Gaussian noise to interactive predictions; off makes them cacheable
+    'noise': True,
+    # Seed for each session's noise generator (unset: fresh entropy)
+    'noiseSeed': None,
+    # Entries in the shared LRU cache of noise-free predictions
+    'predictionCacheSize': 4096,
+    # Answer noise-free predictions from a precomputed memory-mapped grid
+    'lookupTable': False,
+    'lookupTableDir': 'lookup_tables',
+    # Score concurrent sessions' predictions together in one vectorized call
+    'microBatching': False,
+    'batchWindowMs': 2.0,
+    'maxBatchSize': 256,
+    # Byte budget (MB) of the shared cache of large session artifacts such as scored uploads
+    'artifactCacheMb': 512,
+    # Sessions idle this long lose their cached artifacts
+    'sessionIdleMinutes': 30,
+    # Time each stage of app.py reruns (also per session with ?diagnostics=1)
+    'instrumentation': False,
+    # Prometheus text file rewritten after each instrumented rerun (unset: none)
+    'metricsFile': None,
+}
+
+
+def load_settings(path=CONFIG_PATH):
+    """Return DEFAULTS overridden by the [predictor] section of predictor.toml"""
+    settings = dict(DEFAULTS)
+    if tomllib is None or not Path(path).exists():
+        return settings
+    with open(path, 'rb') as f:
+        config = tomllib.load(f)
+    settings.update(config.get('predictor', {}))
+    return settings
+
+
+def resolve_path(value):
+    """Resolve a path setting relative to the directory of predictor.toml"""
+    return CONFIG_PATH.parent / value
+
+
+settings = load_settings()
@@ -0,0 +1,38 @@
+"""Page styling: the static stylesheet plus a per-rerun theme/direction marker"""
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).with_name('static')
+STYLESHEET_PATH = STATIC_DIR / 'style.css'
+# Streamlit serves ./static/* at app/static/* when server.enableStaticServing is on
+STYLESHEET_URL = 'app/static/style.css'
+
+
+@lru_cache(maxsize=1)
+def stylesheet_version():
+    """Short content hash of style.css, used to bust browser caches on change"""
+    return hashlib.sha1(STYLESHEET_PATH.read_bytes()).hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def stylesheet_text():
+    return STYLESHEET_PATH.read_text(encoding='utf-8')
+
+
+@lru_cache(maxsize=None)
+def get_inline_css(theme, language, static_serving=True):
+    """Generate the per-rerun style payload with proper RTL support
+
+    All rules live in static/style.css, which the browser downloads once and
+    caches. The payload only links the stylesheet and renders a hidden marker
+    whose classes switch the theme and direction CSS variables. Without
+    static serving the link would 404, so the stylesheet is inlined instead.
+    """
+    theme_class = 'theme-dark' if theme == 'dark' else 'theme-light'
+    direction_class = 'dir-rtl' if language == 'ar' else 'dir-ltr'
+    if static_serving:
+        stylesheet = f'<link rel="stylesheet" href="{STYLESHEET_URL}?v={stylesheet_version()}">'
+    else:
+        stylesheet = f'<style>{stylesheet_text()}</style>'
+    return stylesheet + f'<div class="theme-marker {theme_class} {direction_class}"></div>'
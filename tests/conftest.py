@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_customers(rows, seed=0):
+    """Random customers within the sidebar ranges, with integer customer_id"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': np.arange(rows),
+        'age': rng.integers(18, 71, rows),
+        'income': rng.integers(0, 101, rows) * 5000,
+        'membership_years': rng.integers(0, 21, rows),
+        'purchase_frequency': rng.integers(0, 101, rows),
+    })
+
+
+@pytest.fixture
+def customers():
+    return make_customers(2000)
+
+
+@pytest.fixture
+def customers_csv(tmp_path, customers):
+    path = tmp_path / 'customers.csv'
+    customers.to_csv(path, index=False)
+    return path
@@ -0,0 +1,19 @@
+import io
+
+import pytest
+
+from batch_scoring import BatchJobExpired, score_upload
+from scoring import MOCK_MODEL
+
+
+def test_released_job_fails_with_clear_error(customers):
+    upload = io.BytesIO(customers.to_csv(index=False).encode())
+    job = score_upload(upload, MOCK_MODEL, chunk_size=500)
+    assert len(job.page(3)) == 100
+    job.cleanup()
+
+    assert job.expired
+    with pytest.raises(BatchJobExpired, match="score the file again"):
+        job.export()
+    with pytest.raises(BatchJobExpired):
+        job.page(0)
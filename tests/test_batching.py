@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from batching import PredictionBroker
+from scoring import MOCK_MODEL, make_rng, predict_spending_score
+
+
+def session_scores(predict, seed):
+    """Ten predictions of one session drawing noise from its own seeded generator"""
+    rng = make_rng(seed)
+    return [predict(30 + i, 50000 + 5000 * i, i, 10 * i, rng) for i in range(10)]
+
+
+def test_broker_matches_scalar_per_session():
+    broker = PredictionBroker(MOCK_MODEL, window_ms=5)
+    seeds = range(16)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        batched = list(pool.map(lambda seed: session_scores(lambda *args: broker.predict(*args, timeout=10), seed), seeds))
+
+    def scalar(age, income, membership_years, purchase_frequency, rng):
+        return predict_spending_score(age, income, membership_years, purchase_frequency, MOCK_MODEL, rng)
+
+    assert batched == [session_scores(scalar, seed) for seed in seeds]
+    assert broker.stats()['requests'] == 16 * 10
+
+
+def test_broker_without_noise_matches_model():
+    broker = PredictionBroker(MOCK_MODEL)
+    assert broker.predict(35, 50000, 5, 25, timeout=10) == MOCK_MODEL.predict(35, 50000, 5, 25)
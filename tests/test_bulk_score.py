@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bulk_score import CATEGORY_COLUMN, run, score_chunk
+from scoring import MOCK_MODEL
+
+
+def test_missing_input_gets_no_score_or_category():
+    chunk = pd.DataFrame({'age': [35, None], 'income': [50000, 60000], 'membership_years': [5, 3],
+                          'purchase_frequency': [25, 30]})
+    scored = score_chunk(chunk, MOCK_MODEL, 'en')
+
+    assert np.isnan(scored['spending_score'][1])
+    assert pd.isna(scored[CATEGORY_COLUMN][1])
+    assert not pd.isna(scored[CATEGORY_COLUMN][0])
+    # The blank stays in an integer column instead of turning 35 into 35.0
+    assert str(scored['age'].dtype) == 'Int64'
+
+
+def test_fractional_value_in_later_chunk_widens_parquet_column(tmp_path, customers):
+    pytest.importorskip('pyarrow')
+    customers = customers.astype({'age': 'float64'})
+    customers.loc[1500, 'age'] = 70.5
+    path = tmp_path / 'customers.csv'
+    customers.to_csv(path, index=False, float_format='%g')
+
+    rows = run(path, tmp_path / 'scored.parquet', MOCK_MODEL, chunk_size=500, quiet=True)
+    scored = pd.read_parquet(tmp_path / 'scored.parquet')
+    assert rows == len(scored) == len(customers)
+    assert scored['age'].dtype == np.float64
+    assert scored['age'].tolist() == customers['age'].tolist()
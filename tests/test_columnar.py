@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bulk_score
+from columnar import (ID_COLUMN, MANIFEST_NAME, MISSING_ID, TIER_COLUMN, TIER_UNSCORED, ParquetColumnWriter,
+                      RawColumnWriter, read_columnar, read_manifest, score_columns)
+from scoring import MOCK_MODEL
+
+
+def test_failed_run_writes_no_manifest(tmp_path):
+    with pytest.raises(RuntimeError):
+        with RawColumnWriter(tmp_path / 'partial', MOCK_MODEL.version) as writer:
+            writer.write({'spending_score': np.zeros(3, dtype=np.float32)})
+            raise RuntimeError("scoring failed")
+    assert not (tmp_path / 'partial' / MANIFEST_NAME).exists()
+
+
+def test_missing_input_gets_unscored_tier(tmp_path, customers):
+    customers = customers.astype({'income': 'float64'})
+    customers.loc[5, 'income'] = np.nan
+    with RawColumnWriter(tmp_path / 'scored', MOCK_MODEL.version) as writer:
+        writer.write(score_columns(customers, MOCK_MODEL))
+
+    tiers = read_columnar(tmp_path / 'scored')[TIER_COLUMN]
+    assert read_manifest(tmp_path / 'scored')['unscored_tier'] == TIER_UNSCORED
+    assert tiers[5] == TIER_UNSCORED
+    assert (np.delete(tiers, 5) < TIER_UNSCORED).all()
+
+
+@pytest.mark.parametrize('output', ['scored', 'scored.parquet'])
+def test_blank_id_in_later_chunk_keeps_id_column(tmp_path, customers, output):
+    if output.endswith('.parquet'):
+        pytest.importorskip('pyarrow')
+    customers = customers.astype({'customer_id': 'float64'})
+    customers.loc[1500, 'customer_id'] = np.nan
+    path = tmp_path / 'customers.csv'
+    customers.to_csv(path, index=False, float_format='%.0f')
+
+    bulk_score.run(path, tmp_path / output, MOCK_MODEL, chunk_size=500, quiet=True, output_format='columnar')
+    if output.endswith('.parquet'):
+        ids = pd.read_parquet(tmp_path / output)[ID_COLUMN].to_numpy()
+    else:
+        ids = read_columnar(tmp_path / output)[ID_COLUMN]
+    assert ids.dtype == np.int64
+    assert ids[1500] == MISSING_ID
+    assert ids[1499] == 1499 and ids[1501] == 1501
+
+
+def test_failed_run_leaves_no_parquet_file(tmp_path):
+    pytest.importorskip('pyarrow')
+    with pytest.raises(RuntimeError):
+        with ParquetColumnWriter(tmp_path / 'partial.parquet', MOCK_MODEL.version) as writer:
+            writer.write({'spending_score': np.zeros(3, dtype=np.float32)})
+            raise RuntimeError("scoring failed")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+import incremental
+from columnar import read_columnar
+from scoring import MOCK_MODEL
+
+
+def test_incremental_matches_full_rescore(tmp_path, customers):
+    first = tmp_path / 'first.csv'
+    customers.to_csv(first, index=False)
+    incremental.run(first, tmp_path / 'previous', MOCK_MODEL, quiet=True)
+
+    # Change some customers, drop some and add new ones
+    changed = customers.copy()
+    changed.loc[::7, 'income'] += 5000
+    changed = changed.drop(index=range(0, 2000, 11))
+    extra = customers.tail(50).assign(customer_id=lambda df: df['customer_id'] + 10000)
+    changed = pd.concat([changed.sample(frac=1, random_state=0), extra])
+    second = tmp_path / 'second.csv'
+    changed.to_csv(second, index=False)
+
+    rows, reused = incremental.run(second, tmp_path / 'incremental', MOCK_MODEL, tmp_path / 'previous',
+                                   chunk_size=300, explain=True, quiet=True)
+    incremental.run(second, tmp_path / 'full', MOCK_MODEL, chunk_size=300, explain=True, quiet=True)
+
+    assert rows == len(changed)
+    assert 0 < reused < rows
+    result, expected = read_columnar(tmp_path / 'incremental'), read_columnar(tmp_path / 'full')
+    assert result.keys() == expected.keys()
+    for name in expected:
+        np.testing.assert_array_equal(result[name], expected[name], err_msg=name)
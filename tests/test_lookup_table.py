@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from lookup_table import LookupTable
+from scoring import AGE_MAX, AGE_MIN, FREQUENCY_MAX, INCOME_MAX, INCOME_STEP, MEMBERSHIP_MAX, MOCK_MODEL
+
+
+@pytest.fixture(scope='module')
+def table(tmp_path_factory):
+    return LookupTable.load_or_build(tmp_path_factory.mktemp('lookup_tables'), MOCK_MODEL)
+
+
+def test_table_matches_model(table):
+    rng = np.random.default_rng(0)
+    for _ in range(5000):
+        inputs = (
+            int(rng.integers(AGE_MIN, AGE_MAX + 1)),
+            int(rng.integers(0, INCOME_MAX // INCOME_STEP + 1)) * INCOME_STEP,
+            int(rng.integers(0, MEMBERSHIP_MAX + 1)),
+            int(rng.integers(0, FREQUENCY_MAX + 1)),
+        )
+        assert table.get(*inputs) == MOCK_MODEL.predict(*inputs)
+
+
+def test_table_corners_match_model(table):
+    for inputs in [(AGE_MIN, 0, 0, 0), (AGE_MAX, INCOME_MAX, MEMBERSHIP_MAX, FREQUENCY_MAX)]:
+        assert table.get(*inputs) == MOCK_MODEL.predict(*inputs)
+
+
+def test_off_grid_inputs_fall_back(table):
+    assert table.get(AGE_MIN - 1, 50000, 5, 25) is None
+    assert table.get(35, 50001, 5, 25) is None
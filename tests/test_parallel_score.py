@@ -0,0 +1,51 @@
+import csv
+
+import pandas as pd
+import pytest
+
+import bulk_score
+import parallel_score
+from scoring import MOCK_MODEL
+
+# Small parts so a 2000-row test file is split several ways
+PART_BYTES = 8 * 1024
+
+
+def test_parallel_matches_bulk_without_noise(tmp_path, customers_csv):
+    bulk_score.run(customers_csv, tmp_path / 'bulk.csv', MOCK_MODEL, chunk_size=500, quiet=True)
+    parallel_score.run(customers_csv, tmp_path / 'parallel.csv', MOCK_MODEL, workers=2, chunk_size=500,
+                       noise=False, quiet=True, part_bytes=PART_BYTES)
+    assert (tmp_path / 'parallel.csv').read_bytes() == (tmp_path / 'bulk.csv').read_bytes()
+
+
+def test_seeded_output_does_not_depend_on_workers(tmp_path, customers_csv):
+    for workers in (1, 3):
+        parallel_score.run(customers_csv, tmp_path / f"scored-{workers}.csv", MOCK_MODEL, workers=workers,
+                           seed=7, quiet=True, part_bytes=PART_BYTES)
+    assert (tmp_path / 'scored-1.csv').read_bytes() == (tmp_path / 'scored-3.csv').read_bytes()
+    assert (tmp_path / 'scored-1.csv').read_bytes() != b''
+
+
+def test_blank_input_keeps_parquet_parts_compatible(tmp_path, customers):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    customers = customers.astype({'age': 'float64'})
+    customers.loc[1900, 'age'] = None
+    path = tmp_path / 'customers.csv'
+    customers.to_csv(path, index=False, float_format='%.0f')
+
+    parallel_score.run(path, tmp_path / 'scored.parquet', MOCK_MODEL, workers=2, noise=False, quiet=True,
+                       part_bytes=PART_BYTES)
+    bulk_score.run(path, tmp_path / 'bulk.parquet', MOCK_MODEL, rng=None, quiet=True)
+    # Same Arrow schema and values; only the pandas metadata of the parts differs
+    scored, bulk = (pq.read_table(tmp_path / name).replace_schema_metadata() for name in ('scored.parquet', 'bulk.parquet'))
+    assert scored.schema.field('age').type == pa.int64()
+    assert scored.equals(bulk)
+
+
+def test_quoted_header(tmp_path, customers):
+    path = tmp_path / 'quoted.csv'
+    customers.to_csv(path, index=False, quoting=csv.QUOTE_ALL)
+    parallel_score.run(path, tmp_path / 'scored.csv', MOCK_MODEL, workers=1, noise=False, quiet=True)
+    assert len(pd.read_csv(tmp_path / 'scored.csv')) == len(customers)
+
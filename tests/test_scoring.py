@@ -0,0 +1,29 @@
+import numpy as np
+
+from scoring import FEATURES, make_rng, predict_spending_score, predict_spending_scores, score_tiers
+
+
+def test_batch_matches_scalar_with_same_seed(customers):
+    inputs = [customers[column].to_numpy() for column in FEATURES]
+    batch = predict_spending_scores(*inputs, rng=make_rng(42))
+
+    rng = make_rng(42)
+    scalar = [predict_spending_score(*row, rng=rng) for row in zip(*(values.tolist() for values in inputs))]
+
+    assert batch.tolist() == scalar
+
+
+def test_batch_matches_scalar_without_noise(customers):
+    inputs = [customers[column].to_numpy() for column in FEATURES]
+    scalar = [predict_spending_score(*row) for row in zip(*(values.tolist() for values in inputs))]
+    assert predict_spending_scores(*inputs).tolist() == scalar
+
+
+def test_scalar_inputs_give_one_score():
+    scores = predict_spending_scores(35, 50000, 5, 25)
+    assert scores.shape == (1,)
+    assert scores[0] == predict_spending_score(35, 50000, 5, 25)
+
+
+def test_score_tiers_match_recommendation_thresholds():
+    assert score_tiers([10.0, 50.0, 80.0]).tolist() == [0, 1, 2]
@@ -0,0 +1,22 @@
+import math
+
+import pytest
+
+from scoring_service import BadRequest, validate_customer
+
+CUSTOMER = {'age': 35, 'income': 50000, 'membership_years': 5, 'purchase_frequency': 25}
+
+
+def test_valid_customer():
+    validate_customer(CUSTOMER)
+
+
+@pytest.mark.parametrize('value', [math.nan, math.inf, 10 ** 400, '35', True, None])
+def test_rejects_non_finite_or_non_numeric(value):
+    with pytest.raises(BadRequest):
+        validate_customer({**CUSTOMER, 'age': value})
+
+
+def test_rejects_missing_field():
+    with pytest.raises(BadRequest):
+        validate_customer({'age': 35})
@@ -0,0 +1,10 @@
+import numpy as np
+
+from segments import SegmentStats
+
+
+def test_segment_stats_leave_out_unscored_rows():
+    stats = SegmentStats().update(np.array([10.0, np.nan, 90.0]), np.array([1.0, 2.0, 3.0]), np.array([1.0, 1.0, 1.0]))
+    assert stats.count.sum() == 2
+    assert stats.unscored == 1
+    assert SegmentStats.from_dict(stats.to_dict()).unscored == 1
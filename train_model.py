@@ -0,0 +1,85 @@
+"""Fit the spending score regression on a customer dataset
+
+Usage:
+    python train_model.py customers.csv
+    python train_model.py customers.parquet --target spending_score --output model.npz
+
+The dataset needs the age, income, membership_years and purchase_frequency
+columns plus a target score column. The fitted coefficients and the
+normalisation bounds are saved as a small .npz that scoring.load_model()
+reads without importing scikit-learn.
+"""
+import argparse
+import hashlib
+import sys
+
+import numpy as np
+import pandas as pd
+
+from scoring import FEATURES, MOCK_MODEL, MODEL_PATH, SCORE_COLUMN, SpendingModel
+
+
+def read_dataset(path):
+    if str(path).lower().endswith(('.parquet', '.pq')):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def normalised_features(df, model):
+    """Normalise the FEATURES columns with the bounds and caps of model"""
+    columns = []
+    for column, lower, upper, cap in zip(FEATURES, model.lower, model.upper, model.cap):
+        values = df[column].to_numpy(dtype=np.float64)
+        columns.append(np.minimum((values - lower) / (upper - lower), cap))
+    return np.column_stack(columns)
+
+
+def train(df, target=SCORE_COLUMN):
+    """Fit a LinearRegression and return it as a SpendingModel"""
+    from sklearn.linear_model import LinearRegression
+
+    missing = [column for column in FEATURES + [target] if column not in df.columns]
+    if missing:
+        raise KeyError(f"Missing columns: {', '.join(missing)}")
+
+    df = df.dropna(subset=FEATURES + [target])
+    # Keep the input ranges of the app so the sidebar limits still apply
+    X = normalised_features(df, MOCK_MODEL)
+    y = df[target].to_numpy(dtype=np.float64)
+
+    regression = LinearRegression().fit(X, y)
+    residuals = y - regression.predict(X)
+
+    params = np.concatenate([regression.coef_, [regression.intercept_]])
+    version = 'lr-' + hashlib.sha1(params.tobytes()).hexdigest()[:10]
+
+    return SpendingModel(
+        weights=regression.coef_,
+        intercept=regression.intercept_,
+        lower=MOCK_MODEL.lower,
+        upper=MOCK_MODEL.upper,
+        cap=MOCK_MODEL.cap,
+        noise_std=residuals.std(),
+        version=version,
+    ), regression.score(X, y)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the spending score model")
+    parser.add_argument('data', help="CSV or Parquet customer dataset")
+    parser.add_argument('--target', default=SCORE_COLUMN, help="Target score column (default: %(default)s)")
+    parser.add_argument('--output', default=str(MODEL_PATH), help="Model artifact to write (default: model.npz)")
+    args = parser.parse_args(argv)
+
+    try:
+        model, r2 = train(read_dataset(args.data), args.target)
+    except KeyError as exc:
+        sys.exit(f"Error: {exc}")
+
+    model.save(args.output)
+    weights = ', '.join(f"{name}={weight:.2f}" for name, weight in zip(FEATURES, model.weights))
+    print(f"Saved {model.version} to {args.output}: intercept={model.intercept:.2f}, {weights}, R²={r2:.3f}")
+
+
+if __name__ == '__main__':
+    main()
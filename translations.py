@@ -0,0 +1,250 @@
+import sys
+from types import MappingProxyType
+
+# UI strings per language
+_translations = {
+    'en': {
+        'title': 'Customer Spending Score Predictor',
+        'subtitle': 'Predict customer value and get actionable business insights',
+        'customer_info': 'Customer Information',
+        'age': 'Age',
+        'age_label': 'Select customer age',
+        'age_help': 'Age of the customer in years',
+        'annual_income': 'Annual Income',
+        'income_label': 'Enter annual income ($)',
+        'income_help': "Customer's annual income in USD",
+        'membership_years': 'Membership Years',
+        'membership_label': 'Years as member',
+        'membership_help': 'Number of years the customer has been a member',
+        'purchase_frequency': 'Purchase Frequency',
+        'frequency_label': 'Purchases per year',
+        'frequency_help': 'Number of purchases made per year',
+        'predict_button': 'Predict Spending Score',
+        'input_summary': 'Input Summary',
+        'feature_analysis': 'Feature Analysis',
+        'feature': 'Feature',
+        'value': 'Value',
+        'years': 'years',
+        'purchases_per_year': 'purchases/year',
+        'analyzing': 'Analyzing customer data...',
+        'prediction_results': 'Prediction Results',
+        'spending_score': 'Spending Score',
+        'out_of': 'out of 100',
+        'customer_category': 'Customer Category',
+        'above_average': 'Above Average',
+        'below_average': 'Below Average',
+        'quick_stats': 'Quick Stats',
+        'income_level': 'Income Level',
+        'high': 'High',
+        'moderate': 'Moderate',
+        'low': 'Low',
+        'loyalty': 'Loyalty',
+        'strong': 'Strong',
+        'growing': 'Growing',
+        'new': 'New',
+        'business_recommendation': 'Business Recommendation',
+        'recommended_actions': 'Recommended Actions',
+        'high_value': 'High Value Customer',
+        'medium_value': 'Medium Value Customer',
+        'low_value': 'Low Value Customer',
+        'high_value_rec': 'Target with VIP offers, exclusive deals, and personalized premium services. Consider loyalty rewards program.',
+        'medium_value_rec': 'Engage with targeted promotions and upselling opportunities. Focus on increasing purchase frequency.',
+        'low_value_rec': 'Focus on retention strategies, entry-level offers, and building engagement through educational content.',
+        'welcome_msg': 'Please enter customer information in the sidebar and click \'Predict Spending Score\' to get started!',
+        'how_it_works': 'How It Works',
+        'enter_data': 'Enter Data',
+        'enter_data_desc': 'Input customer demographics and behavioral data',
+        'ai_analysis': 'AI Analysis',
+        'ai_analysis_desc': 'Linear regression model predicts spending potential',
+        'get_insights': 'Get Insights',
+        'get_insights_desc': 'Receive actionable business recommendations',
+        'copyright': 'All rights reserved',
+        'developed_by': 'Developed by: Mishal Al-Shammari',
+        'language': 'Language',
+        'theme': 'Theme',
+        'light_mode': 'Light Mode',
+        'dark_mode': 'Dark Mode',
+        'high_rec_1': 'Offer exclusive VIP membership benefits',
+        'high_rec_2': 'Provide personalized shopping experiences',
+        'high_rec_3': 'Early access to new products and sales',
+        'high_rec_4': 'Dedicated customer support channel',
+        'high_rec_5': 'Premium loyalty rewards program',
+        'medium_rec_1': 'Send targeted promotional emails',
+        'medium_rec_2': 'Offer bundle deals and discounts',
+        'medium_rec_3': 'Implement referral program',
+        'medium_rec_4': 'Create urgency with limited-time offers',
+        'medium_rec_5': 'Encourage repeat purchases with rewards',
+        'low_rec_1': 'Welcome discount for next purchase',
+        'low_rec_2': 'Educational content about products',
+        'low_rec_3': 'Engagement through social media',
+        'low_rec_4': 'Simple loyalty point system',
+        'low_rec_5': 'Regular newsletter with tips and deals',
+        'diagnostics': 'Diagnostics',
+        'model_time': 'Model Time',
+        'p99_latency': 'p99 Latency',
+        'latency_budget': 'Latency Budget',
+        'predictions_measured': 'Predictions measured',
+        'within_budget': 'Predictions are within the p99 latency budget.',
+        'over_budget': 'p99 prediction latency exceeds the configured budget.',
+        'prediction_cache': 'Prediction cache',
+        'cache_hits': 'hits',
+        'cache_misses': 'misses',
+        'rerun_profile': 'Rerun Profile',
+        'stage': 'Stage',
+        'this_rerun': 'This rerun',
+        'average': 'Average',
+        'total': 'Total',
+        'sensitivity': 'What-if Sensitivity',
+        'sensitivity_desc': 'Noise-free score for this customer across the full range of one or two inputs, with the other inputs held fixed.',
+        'sweep_x': 'Vary',
+        'sweep_y': 'Against',
+        'sweep_none': 'Nothing (line chart)',
+        'single_tab': 'Single Customer',
+        'batch_tab': 'Batch Scoring',
+        'batch_scoring': 'Score a Customer File',
+        'batch_desc': 'Upload a CSV with age, income, membership_years and purchase_frequency columns. Every row gets a spending score and a customer category.',
+        'upload_csv': 'Customer CSV',
+        'score_file': 'Score File',
+        'rows_scored': 'rows scored',
+        'batch_error': 'Could not score this file',
+        'batch_expired': 'The scored file was removed to free memory. Please score it again.',
+        'page': 'Page',
+        'download_scored': 'Download Scored CSV',
+        'micro_batching': 'Micro-batching',
+        'batches': 'batches',
+        'mean_batch_size': 'mean size',
+        'largest_batch': 'largest',
+        'session_memory': 'Session memory',
+        'session_artifacts': 'artifacts',
+        'shared_artifacts': 'Shared artifacts',
+        'active_sessions': 'Active sessions'
+    },
+    'ar': {
+        'title': 'متنبئ درجة إنفاق العملاء',
+        'subtitle': 'توقع قيمة العملاء واحصل على رؤى عملية قابلة للتنفيذ',
+        'customer_info': 'معلومات العميل',
+        'age': 'العمر',
+        'age_label': 'اختر عمر العميل',
+        'age_help': 'عمر العميل بالسنوات',
+        'annual_income': 'الدخل السنوي',
+        'income_label': 'أدخل الدخل السنوي (دولار)',
+        'income_help': 'الدخل السنوي للعميل بالدولار الأمريكي',
+        'membership_years': 'سنوات العضوية',
+        'membership_label': 'سنوات كعضو',
+        'membership_help': 'عدد السنوات التي كان فيها العميل عضواً',
+        'purchase_frequency': 'تكرار الشراء',
+        'frequency_label': 'المشتريات في السنة',
+        'frequency_help': 'عدد المشتريات التي تمت في السنة',
+        'predict_button': 'توقع درجة الإنفاق',
+        'input_summary': 'ملخص المدخلات',
+        'feature_analysis': 'تحليل الميزات',
+        'feature': 'الميزة',
+        'value': 'القيمة',
+        'years': 'سنوات',
+        'purchases_per_year': 'مشتريات/سنة',
+        'analyzing': 'جاري تحليل بيانات العميل...',
+        'prediction_results': 'نتائج التوقع',
+        'spending_score': 'درجة الإنفاق',
+        'out_of': 'من 100',
+        'customer_category': 'فئة العميل',
+        'above_average': 'فوق المتوسط',
+        'below_average': 'تحت المتوسط',
+        'quick_stats': 'إحصائيات سريعة',
+        'income_level': 'مستوى الدخل',
+        'high': 'مرتفع',
+        'moderate': 'متوسط',
+        'low': 'منخفض',
+        'loyalty': 'الولاء',
+        'strong': 'قوي',
+        'growing': 'متنامي',
+        'new': 'جديد',
+        'business_recommendation': 'التوصية التجارية',
+        'recommended_actions': 'الإجراءات الموصى بها',
+        'high_value': 'عميل ذو قيمة عالية',
+        'medium_value': 'عميل ذو قيمة متوسطة',
+        'low_value': 'عميل ذو قيمة منخفضة',
+        'high_value_rec': 'استهدف بعروض VIP وصفقات حصرية وخدمات مميزة شخصية. فكر في برنامج مكافآت الولاء.',
+        'medium_value_rec': 'تفاعل مع العروض الترويجية المستهدفة وفرص البيع الإضافي. ركز على زيادة تكرار الشراء.',
+        'low_value_rec': 'ركز على استراتيجيات الاحتفاظ والعروض الأولية وبناء المشاركة من خلال المحتوى التعليمي.',
+        'welcome_msg': 'يرجى إدخال معلومات العميل في الشريط الجانبي والنقر على \'توقع درجة الإنفاق\' للبدء!',
+        'how_it_works': 'كيف يعمل',
+        'enter_data': 'إدخال البيانات',
+        'enter_data_desc': 'أدخل البيانات الديموغرافية والسلوكية للعميل',
+        'ai_analysis': 'تحليل الذكاء الاصطناعي',
+        'ai_analysis_desc': 'نموذج الانحدار الخطي يتوقع إمكانات الإنفاق',
+        'get_insights': 'احصل على رؤى',
+        'get_insights_desc': 'تلقى توصيات تجارية قابلة للتنفيذ',
+        'copyright': 'جميع الحقوق محفوظة',
+        'developed_by': 'تطوير: مشعل الشمري',
+        'language': 'اللغة',
+        'theme': 'المظهر',
+        'light_mode': 'الوضع النهاري',
+        'dark_mode': 'الوضع الليلي',
+        'high_rec_1': 'تقديم مزايا عضوية VIP حصرية',
+        'high_rec_2': 'توفير تجارب تسوق مخصصة',
+        'high_rec_3': 'الوصول المبكر للمنتجات والتخفيضات الجديدة',
+        'high_rec_4': 'قناة دعم عملاء مخصصة',
+        'high_rec_5': 'برنامج مكافآت ولاء مميز',
+        'medium_rec_1': 'إرسال رسائل ترويجية مستهدفة',
+        'medium_rec_2': 'تقديم عروض حزم وخصومات',
+        'medium_rec_3': 'تطبيق برنامج الإحالة',
+        'medium_rec_4': 'خلق شعور بالإلحاح مع عروض محدودة',
+        'medium_rec_5': 'تشجيع الشراء المتكرر بالمكافآت',
+        'low_rec_1': 'خصم ترحيبي للشراء التالي',
+        'low_rec_2': 'محتوى تعليمي عن المنتجات',
+        'low_rec_3': 'التفاعل عبر وسائل التواصل الاجتماعي',
+        'low_rec_4': 'نظام نقاط ولاء بسيط',
+        'low_rec_5': 'نشرة إخبارية منتظمة مع نصائح وعروض',
+        'diagnostics': 'التشخيص',
+        'model_time': 'زمن النموذج',
+        'p99_latency': 'زمن الاستجابة p99',
+        'latency_budget': 'حد زمن الاستجابة',
+        'predictions_measured': 'التوقعات المقاسة',
+        'within_budget': 'التوقعات ضمن حد زمن الاستجابة p99.',
+        'over_budget': 'زمن استجابة التوقع p99 يتجاوز الحد المحدد.',
+        'prediction_cache': 'ذاكرة التوقعات المؤقتة',
+        'cache_hits': 'إصابات',
+        'cache_misses': 'إخفاقات',
+        'rerun_profile': 'ملف إعادة التشغيل',
+        'stage': 'المرحلة',
+        'this_rerun': 'إعادة التشغيل الحالية',
+        'average': 'المتوسط',
+        'total': 'الإجمالي',
+        'sensitivity': 'تحليل الحساسية (ماذا لو)',
+        'sensitivity_desc': 'الدرجة بدون ضوضاء لهذا العميل عبر النطاق الكامل لمدخل أو مدخلين، مع تثبيت باقي المدخلات.',
+        'sweep_x': 'تغيير',
+        'sweep_y': 'مقابل',
+        'sweep_none': 'لا شيء (رسم خطي)',
+        'single_tab': 'عميل واحد',
+        'batch_tab': 'تقييم دفعة',
+        'batch_scoring': 'تقييم ملف عملاء',
+        'batch_desc': 'ارفع ملف CSV يحتوي على الأعمدة age و income و membership_years و purchase_frequency. يحصل كل صف على درجة إنفاق وفئة عميل.',
+        'upload_csv': 'ملف CSV للعملاء',
+        'score_file': 'تقييم الملف',
+        'rows_scored': 'صف تم تقييمه',
+        'batch_error': 'تعذر تقييم هذا الملف',
+        'batch_expired': 'تمت إزالة الملف المقيّم لتوفير الذاكرة. يرجى تقييمه مرة أخرى.',
+        'page': 'الصفحة',
+        'download_scored': 'تنزيل ملف CSV المقيّم',
+        'micro_batching': 'التجميع المصغر',
+        'batches': 'دفعات',
+        'mean_batch_size': 'متوسط الحجم',
+        'largest_batch': 'الأكبر',
+        'session_memory': 'ذاكرة الجلسة',
+        'session_artifacts': 'ملفات',
+        'shared_artifacts': 'الملفات المشتركة',
+        'active_sessions': 'الجلسات النشطة'
+    }
+}
+
+
+def _freeze(tables):
+    """Read-only per-language tables with interned keys and strings, built once per process"""
+    return MappingProxyType({
+        language: MappingProxyType({sys.intern(key): sys.intern(text) for key, text in strings.items()})
+        for language, strings in tables.items()
+    })
+
+
+translations = _freeze(_translations)
+del _translations